@@ -4,9 +4,9 @@ Maze Runner - single-file Python game (pygame)
 Features:
 - Start / Restart / Exit buttons
 - 100 levels (difficulty increases)
-- Maze generated per level (DFS carve)
+- Maze generated per level (DFS carve by default; Kruskal, Prim, Wilson, Eller, binary tree selectable)
 - Player & Enemy same speed
-- Enemy chases using grid BFS pathfinding
+- Enemy chases using grid BFS pathfinding (A*, jump point search, corridor graph selectable)
 - 3 lives per round
 - On-screen touch buttons (for mobile packaging)
 - Sounds (bg music, buttons, caught, levelup, gameover)
@@ -19,6 +19,16 @@ Features:
 
 Run:
     python maze_runner.py
+    python maze_runner.py --headless --games 100   # no window/audio, scripted player
+    python maze_runner.py --build-pack levels.mzp --seed 1   # bake all levels to a file
+    python maze_runner.py --pack levels.mzp
+    python maze_runner.py --batch --games 1000 --seed 1   # per-level survival (needs numpy)
+    python maze_runner.py --sweep --seeds 1000            # generator statistics per level
+    python maze_runner.py --algorithm dfs,prim,kruskal    # maze generator, cycled per level
+    python maze_runner.py --bench-generators
+    python maze_runner.py --enemies                # more enemies on higher levels
+    python maze_runner.py --headless --pathfinder jps   # enemy steering: field, repair, table, bfs, astar, jps, corridor
+    python maze_runner.py --stream-maze big.mzs --width 10001 --height 10001   # row-by-row, O(width) memory
 
 Notes on mobile packaging:
 - For Android: consider pygame Subset for Android or pygame_sdl2; another route is converting to Kivy (requires code changes).
@@ -28,16 +38,30 @@ Notes on mobile packaging:
 import pygame
 import sys
 import random
-from collections import deque
+from collections import deque, OrderedDict
+from array import array
+import heapq
 import os
-
-pygame.init()
-pygame.mixer.init()
+import argparse
+import hashlib
+import time
+import mmap
+import struct
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # only the batch simulator needs numpy
+    np = None
 
 # Screen size & grid
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 640
-FPS = 60
+FPS = 60       # default render rate
+SIM_HZ = 60    # simulation ticks per second, independent of the render rate
+SIM_DT = 1.0 / SIM_HZ
+MAX_SIM_STEPS = 5  # ticks one frame may catch up before the simulation just slows down
+DIRTY_RECT_RENDERING = True   # playing screen pushes only changed regions to the display
 
 # Grid (tiles)
 TILE = 32               # tile pixel size
@@ -62,10 +86,15 @@ YELLOW = (240,200,40)
 ORANGE = (255,140,0)
 
 # Player/Enemy
-PLAYER_SPEED = 2      # pixels per frame (will be same for enemy)
+PLAYER_SPEED = 2      # pixels per simulation tick (will be same for enemy)
 ENEMY_SPEED = 2
 PLAYER_SIZE = TILE - 6
 ENEMY_SIZE = TILE - 6
+MAX_ENEMIES = 8        # multi-enemy mode: cap on enemies per level
+ENEMY_LEVEL_STEP = 10  # multi-enemy mode: levels per extra enemy
+
+# Rendered text surfaces kept by render_text()
+TEXT_CACHE_SIZE = 64
 
 # Game constants
 MAX_LEVEL = 100
@@ -80,34 +109,62 @@ SOUND_FILES = {
     'gameover': 'sounds/gameover.wav'
 }
 
-# Initialize screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Maze Runner")
-clock = pygame.time.Clock()
-font = pygame.font.SysFont("Arial", 20)
-big_font = pygame.font.SysFont("Arial", 48)
-
-# Load sounds if present
+# Display, fonts and audio are created by init_display()/init_audio() rather than
+# at import, so batch jobs can import the maze code without opening a window.
+screen = None
+clock = None
+font = None
+big_font = None
 sounds = {}
-for key, path in SOUND_FILES.items():
-    if os.path.exists(path):
-        try:
-            if path.endswith('.mp3') or path.endswith('.wav') or path.endswith('.ogg'):
-                sounds[key] = pygame.mixer.Sound(path) if not path.endswith('.mp3') else pygame.mixer.Sound(path)
-            else:
-                sounds[key] = pygame.mixer.Sound(path)
-        except Exception as e:
-            print(f"Warning: couldn't load {path}: {e}")
-    else:
-        sounds[key] = None
 
-# For mp3 background music, use mixer.music if available
-if os.path.exists(SOUND_FILES['bg']):
+def init_display():
+    global screen, clock, font, big_font
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Maze Runner")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("Arial", 20)
+    big_font = pygame.font.SysFont("Arial", 48)
+
+def init_audio():
     try:
-        pygame.mixer.music.load(SOUND_FILES['bg'])
-        pygame.mixer.music.set_volume(0.5)
+        pygame.mixer.init()
     except Exception as e:
-        print("Warning: couldn't load background music:", e)
+        print("Warning: couldn't initialize audio:", e)
+        return
+
+    # Load sounds if present
+    for key, path in SOUND_FILES.items():
+        if os.path.exists(path):
+            try:
+                sounds[key] = pygame.mixer.Sound(path)
+            except Exception as e:
+                print(f"Warning: couldn't load {path}: {e}")
+        else:
+            sounds[key] = None
+
+    # For mp3 background music, use mixer.music if available
+    if os.path.exists(SOUND_FILES['bg']):
+        try:
+            pygame.mixer.music.load(SOUND_FILES['bg'])
+            pygame.mixer.music.set_volume(0.5)
+        except Exception as e:
+            print("Warning: couldn't load background music:", e)
+
+# Text render cache: static labels are rasterized once, the HUD only when its text changes
+_text_cache = OrderedDict()
+
+def render_text(fnt, text, color, antialias=True):
+    key = (fnt, text, color, antialias)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_cache.move_to_end(key)
+        return surf
+    surf = fnt.render(text, antialias, color)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
 
 # Utility functions
 def play_sound(key):
@@ -131,17 +188,252 @@ def stop_bg_music():
     except:
         pass
 
-# Maze generation using randomized DFS (grid of walkable cells)
-def generate_maze(level):
+# Compact maze storage: one byte per cell, row-major
+class Grid:
     """
-    Create a boolean grid where 0 = wall, 1 = free/path.
-    Difficulty increases with level by making fewer carved cells.
-    We'll generate a standard DFS maze on a cell grid (odd indices are passages).
+    Maze grid backed by a flat bytearray where 0 = wall, 1 = free/path.
+    Cell (x, y) lives at index y*stride + x. The outer ring is always wall,
+    so the flat neighbour offsets in `deltas` never leave the buffer when
+    stepping from an interior cell. grid[y][x] still works for old callers
+    (each row is a memoryview into the same buffer).
     """
-    w = GRID_COLS
-    h = GRID_ROWS
-    # Make grid full walls first
-    grid = [[0 for _ in range(w)] for _ in range(h)]
+    def __init__(self, width, height, fill=0):
+        self.width = width
+        self.height = height
+        self.stride = width
+        self.cells = bytearray([fill]) * (width * height)
+        # same order as DIRS
+        self.deltas = (1, -1, self.stride, -self.stride)
+        view = memoryview(self.cells)
+        self.rows = [view[y*self.stride:y*self.stride + width] for y in range(height)]
+        if fill:
+            self.seal_border()
+
+    @classmethod
+    def from_rows(cls, rows):
+        grid = cls(len(rows[0]), len(rows))
+        for y, row in enumerate(rows):
+            grid.rows[y][:] = bytes(row)
+        grid.seal_border()
+        return grid
+
+    def __getitem__(self, y):
+        return self.rows[y]
+
+    def seal_border(self):
+        w = self.width
+        h = self.height
+        for x in range(w):
+            self.cells[x] = 0
+            self.cells[(h-1)*self.stride + x] = 0
+        for y in range(h):
+            self.cells[y*self.stride] = 0
+            self.cells[y*self.stride + w-1] = 0
+
+    def index(self, x, y):
+        return y*self.stride + x
+
+    def cell(self, idx):
+        y, x = divmod(idx, self.stride)
+        return x, y
+
+    def interior(self, x, y):
+        return 0 < x < self.width-1 and 0 < y < self.height-1
+
+    def is_open(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y*self.stride + x] == 1
+
+def as_grid(grid):
+    # accept legacy list-of-lists grids (and bitboards) anywhere a Grid is expected
+    if isinstance(grid, Grid):
+        return grid
+    if isinstance(grid, BitGrid):
+        return grid.to_grid()
+    return Grid.from_rows(grid)
+
+# Bitboard maze: one bit per cell, each row a Python int (bit x = cell x, 1 = path)
+_CELLS_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_DIGITS_TO_CELLS = bytes.maketrans(b'01', b'\x00\x01')
+
+def cells_to_bits(row):
+    # one row of 0/1 cell bytes -> int with bit x set for an open cell x
+    return int(bytes(row)[::-1].translate(_CELLS_TO_DIGITS) or b'0', 2)
+
+def fill_runs(seed, mask, width):
+    # spread seed bits along every run of set bits in mask, both ways, in log2(width) steps
+    up = down = seed & mask
+    pu = pd = mask
+    shift = 1
+    while shift < width:
+        up |= pu & (up << shift)
+        pu &= pu << shift
+        down |= pd & (down >> shift)
+        pd &= pd >> shift
+        shift <<= 1
+    return up | down
+
+class BitGrid:
+    """
+    Maze stored as one int per row. Neighbour expansion works on whole rows at
+    once: (bits << 1 | bits >> 1) & row reaches left/right neighbours and
+    bits & row_above reaches up, so flood fills cost big-int ops per row
+    instead of Python work per cell.
+    """
+    def __init__(self, width, height, rows=None):
+        self.width = width
+        self.height = height
+        self.rows = list(rows) if rows is not None else [0] * height
+
+    @classmethod
+    def from_grid(cls, grid):
+        grid = as_grid(grid)
+        return cls(grid.width, grid.height, [cells_to_bits(row) for row in grid.rows])
+
+    def to_grid(self):
+        grid = Grid(self.width, self.height)
+        for y, bits in enumerate(self.rows):
+            grid.rows[y][:] = format(bits, f'0{self.width}b')[::-1].encode().translate(_DIGITS_TO_CELLS)
+        return grid
+
+    def row_bytes(self):
+        n = (self.width + 7) // 8
+        return b''.join(bits.to_bytes(n, 'little') for bits in self.rows)
+
+    def is_open(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and (self.rows[y] >> x) & 1 == 1
+
+    def flood_fill(self, start):
+        # rows of cells reachable from start; scanline fill with a worklist of rows
+        w = self.width
+        h = self.height
+        open_rows = self.rows
+        reached = [0] * h
+        x, y = start
+        if not self.is_open(x, y):
+            return reached
+        reached[y] = fill_runs(1 << x, open_rows[y], w)
+        work = [y - 1, y + 1]
+        while work:
+            y = work.pop()
+            if not 0 <= y < h:
+                continue
+            seed = (reached[y-1] if y > 0 else 0) | (reached[y+1] if y < h-1 else 0)
+            seed &= open_rows[y] & ~reached[y]
+            if not seed:
+                continue
+            reached[y] |= fill_runs(seed, open_rows[y], w)
+            work.append(y - 1)
+            work.append(y + 1)
+        return reached
+
+    def reachable(self, start, goal):
+        gx, gy = goal
+        return (self.flood_fill(start)[gy] >> gx) & 1 == 1
+
+def bit_bfs_path(grid, start, goal):
+    # layered BFS on a BitGrid: each layer is {row: bits}, expanded a row at a time
+    if start == goal:
+        return [start]
+    gx, gy = goal
+    # the scanline fill rejects unreachable goals far faster than exhausting the layers
+    if not grid.is_open(gx, gy) or not grid.reachable(start, goal):
+        return None
+    h = grid.height
+    open_rows = grid.rows
+    sx, sy = start
+    reached = [0] * h
+    reached[sy] = 1 << sx
+    frontier = {sy: 1 << sx}
+    layers = [frontier]
+    found = False
+    while frontier and not found:
+        nxt = {}
+        for y, bits in frontier.items():
+            side = ((bits << 1) | (bits >> 1)) & open_rows[y] & ~reached[y]
+            if side:
+                nxt[y] = nxt.get(y, 0) | side
+            for ny in (y - 1, y + 1):
+                if 0 <= ny < h:
+                    vert = bits & open_rows[ny] & ~reached[ny]
+                    if vert:
+                        nxt[ny] = nxt.get(ny, 0) | vert
+        for y, bits in nxt.items():
+            reached[y] |= bits
+        frontier = nxt
+        if nxt:
+            layers.append(nxt)
+            found = (nxt.get(gy, 0) >> gx) & 1 == 1
+    if not found:
+        return None
+    # walk back one layer at a time
+    path = [goal]
+    cx, cy = goal
+    for layer in reversed(layers[:-1]):
+        for dx, dy in DIRS:
+            nx, ny = cx + dx, cy + dy
+            if nx >= 0 and (layer.get(ny, 0) >> nx) & 1:
+                cx, cy = nx, ny
+                break
+        path.append((cx, cy))
+    path.reverse()
+    return path
+
+# Per-level random streams: the same (game seed, level) always gives the same maze
+def level_seed(game_seed, level):
+    # sha256 rather than hash() so seeds agree across runs and processes
+    digest = hashlib.sha256(f"{game_seed}:{level}".encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def level_rng(game_seed, level):
+    return random.Random(level_seed(game_seed, level))
+
+def new_game_seed():
+    return random.randrange(2**63)
+
+# Maze carvers: each turns a solid Grid into a perfect maze (a spanning tree) on the
+# odd lattice, i.e. cells at odd (x, y) are rooms and the cells between them are walls.
+def lattice_size(grid):
+    return (grid.width - 1) // 2, (grid.height - 1) // 2
+
+def carve_link(grid, i, j, ni, nj):
+    # open lattice cells (i, j), (ni, nj) and the wall between them
+    cells = grid.cells
+    stride = grid.stride
+    x, y = 2*i + 1, 2*j + 1
+    nx, ny = 2*ni + 1, 2*nj + 1
+    cells[y*stride + x] = 1
+    cells[((y + ny)//2)*stride + (x + nx)//2] = 1
+    cells[ny*stride + nx] = 1
+
+class DisjointSet:
+    # union-find with path halving and union by size
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+# Randomized DFS (recursive backtracker): long winding corridors
+def carve_dfs(grid, rng):
+    w = grid.width
+    h = grid.height
+    cells = grid.cells
 
     # We carve on odd coordinates to maintain walls between cells
     def neighbors(cx, cy):
@@ -150,49 +442,288 @@ def generate_maze(level):
         if cx + 2 <= w-2: n.append((cx+2, cy))
         if cy - 2 >= 1: n.append((cx, cy-2))
         if cy + 2 <= h-2: n.append((cx, cy+2))
-        random.shuffle(n)
+        rng.shuffle(n)
         return n
 
-    # Start cell depends slightly on level randomness
     start_x = 1
     start_y = 1
-    grid[start_y][start_x] = 1
+    cells[start_y*w + start_x] = 1
     stack = [(start_x, start_y)]
 
-    carve_chance = max(1, 100 - min(60, level))  # higher level -> smaller carve_chance? We'll tune below
-
     while stack:
         x, y = stack[-1]
-        nb = [p for p in neighbors(x,y) if grid[p[1]][p[0]] == 0]
+        nb = [p for p in neighbors(x,y) if cells[p[1]*w + p[0]] == 0]
         if nb:
-            nx, ny = random.choice(nb)
+            nx, ny = rng.choice(nb)
             # remove the wall between
             wall_x = (x + nx) // 2
             wall_y = (y + ny) // 2
-            grid[wall_y][wall_x] = 1
-            grid[ny][nx] = 1
+            cells[wall_y*w + wall_x] = 1
+            cells[ny*w + nx] = 1
             stack.append((nx, ny))
         else:
             stack.pop()
 
+# Randomized Kruskal: shuffled walls, joined when they separate two components
+def carve_kruskal(grid, rng):
+    cw, ch = lattice_size(grid)
+    edges = [(i, j, i+1, j) for j in range(ch) for i in range(cw-1)]
+    edges += [(i, j, i, j+1) for j in range(ch-1) for i in range(cw)]
+    rng.shuffle(edges)
+    sets = DisjointSet(cw * ch)
+    grid.cells[grid.stride + 1] = 1
+    for i, j, ni, nj in edges:
+        if sets.union(j*cw + i, nj*cw + ni):
+            carve_link(grid, i, j, ni, nj)
+
+# Randomized Prim: grow one tree from a random frontier edge; many short dead ends
+def carve_prim(grid, rng):
+    cw, ch = lattice_size(grid)
+    seen = bytearray(cw * ch)
+    frontier = []
+
+    def add(i, j):
+        seen[j*cw + i] = 1
+        for di, dj in DIRS:
+            ni, nj = i + di, j + dj
+            if 0 <= ni < cw and 0 <= nj < ch and not seen[nj*cw + ni]:
+                frontier.append((i, j, ni, nj))
+
+    grid.cells[grid.stride + 1] = 1
+    add(0, 0)
+    while frontier:
+        k = rng.randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        i, j, ni, nj = frontier.pop()
+        if not seen[nj*cw + ni]:
+            carve_link(grid, i, j, ni, nj)
+            add(ni, nj)
+
+# Wilson: loop-erased random walks, a uniformly random spanning tree
+def carve_wilson(grid, rng):
+    cw, ch = lattice_size(grid)
+    n = cw * ch
+    in_tree = bytearray(n)
+    in_tree[0] = 1
+    grid.cells[grid.stride + 1] = 1
+    exit_dir = [0] * n
+    order = list(range(1, n))
+    rng.shuffle(order)
+    for start in order:
+        if in_tree[start]:
+            continue
+        # walk until the tree is hit, remembering the last exit from each cell (erases loops)
+        cur = start
+        while not in_tree[cur]:
+            j, i = divmod(cur, cw)
+            while True:
+                di, dj = rng.choice(DIRS)
+                if 0 <= i + di < cw and 0 <= j + dj < ch:
+                    break
+            exit_dir[cur] = (di, dj)
+            cur = (j + dj)*cw + i + di
+        # retrace the loop-erased walk into the tree
+        cur = start
+        while not in_tree[cur]:
+            j, i = divmod(cur, cw)
+            di, dj = exit_dir[cur]
+            carve_link(grid, i, j, i + di, j + dj)
+            in_tree[cur] = 1
+            cur = (j + dj)*cw + i + di
+
+def eller_rows(cw, ch, rng):
+    """
+    Eller's algorithm over a cw x ch lattice, one row at a time. Yields
+    (right, down) per row: right[i] joins cells i and i+1, down[i] joins cell i
+    to the one below. Only the current row's set labels are kept, so memory is
+    O(cw) however many rows are produced.
+    """
+    labels = list(range(cw))
+    members = {i: [i] for i in range(cw)}
+    next_label = cw
+    for j in range(ch):
+        last = j == ch - 1
+        right = [False] * (cw - 1)
+        for i in range(cw - 1):
+            a = labels[i]
+            b = labels[i+1]
+            if a != b and (last or rng.random() < 0.5):
+                right[i] = True
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for k in members[b]:
+                    labels[k] = a
+                members[a] += members.pop(b)
+        down = [False] * cw
+        if not last:
+            # every set continues downward at least once
+            for group in members.values():
+                rng.shuffle(group)
+                for k in group[:rng.randint(1, len(group))]:
+                    down[k] = True
+            members = {}
+            for i in range(cw):
+                if not down[i]:
+                    labels[i] = next_label
+                    next_label += 1
+                members.setdefault(labels[i], []).append(i)
+        yield right, down
+
+# Streaming generation: Eller's rows turned straight into grid rows, for mazes too big to hold
+def stream_maze_rows(width, height, rng):
+    """
+    Yield the rows of a width x height maze top to bottom as bytes (0 = wall,
+    1 = path). The maze is the one carve_eller() builds from the same rng,
+    plus generate_maze's corridor to the exit at (width-2, height-2). Only the
+    row being emitted and Eller's per-row state are held in memory.
+    """
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    exit_x, exit_y = width - 2, height - 2
+    lx = exit_x if exit_x % 2 else exit_x - 1
+    ly = exit_y if exit_y % 2 else exit_y - 1
+
+    def finish(row, y):
+        if y == ly:
+            row[lx:exit_x + 1] = b'\x01' * (exit_x + 1 - lx)
+        elif ly < y <= exit_y:
+            row[exit_x] = 1
+        return bytes(row)
+
+    yield bytes(width)
+    y = 1
+    for right, down in eller_rows(cw, ch, rng):
+        room = bytearray(width)
+        room[1:2*cw:2] = b'\x01' * cw
+        for i, joined in enumerate(right):
+            if joined:
+                room[2*i + 2] = 1
+        yield finish(room, y)
+        y += 1
+        if y >= height:
+            break
+        below = bytearray(width)
+        for i, joined in enumerate(down):
+            if joined:
+                below[2*i + 1] = 1
+        yield finish(below, y)
+        y += 1
+    while y < height:
+        yield finish(bytearray(width), y)
+        y += 1
+
+# Streamed maze file: "MZST", u32 width, u32 height, u64 seed, then bit-packed rows as in maze packs
+STREAM_MAGIC = b'MZST'
+STREAM_HEADER = struct.Struct('<4sIIQ')
+
+def write_maze_stream(path, width, height, seed):
+    row_bytes = (width + 7) // 8
+    with open(path, 'wb') as f:
+        f.write(STREAM_HEADER.pack(STREAM_MAGIC, width, height, seed))
+        for row in stream_maze_rows(width, height, random.Random(seed)):
+            f.write(cells_to_bits(row).to_bytes(row_bytes, 'little'))
+
+def read_maze_stream(path):
+    # load a streamed maze file into a BitGrid through mmap
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, width, height, _ = STREAM_HEADER.unpack_from(data, 0)
+        if magic != STREAM_MAGIC:
+            raise ValueError(f"{path}: not a streamed maze file")
+        rb = (width + 7) // 8
+        base = STREAM_HEADER.size
+        rows = [int.from_bytes(data[base + y*rb:base + (y+1)*rb], 'little') for y in range(height)]
+    return BitGrid(width, height, rows)
+
+# Eller: row by row with set labels
+def carve_eller(grid, rng):
+    cw, ch = lattice_size(grid)
+    grid.cells[grid.stride + 1] = 1
+    for j, (right, down) in enumerate(eller_rows(cw, ch, rng)):
+        for i in range(cw - 1):
+            if right[i]:
+                carve_link(grid, i, j, i+1, j)
+        for i in range(cw):
+            if down[i]:
+                carve_link(grid, i, j, i, j+1)
+
+# Binary tree: each cell opens north or west; fastest, strongly biased diagonal texture
+def carve_binary_tree(grid, rng):
+    cw, ch = lattice_size(grid)
+    grid.cells[grid.stride + 1] = 1
+    for j in range(ch):
+        for i in range(cw):
+            options = []
+            if j > 0:
+                options.append((i, j-1))
+            if i > 0:
+                options.append((i-1, j))
+            if options:
+                ni, nj = rng.choice(options)
+                carve_link(grid, i, j, ni, nj)
+
+MAZE_GENERATORS = {
+    'dfs': carve_dfs,
+    'kruskal': carve_kruskal,
+    'prim': carve_prim,
+    'wilson': carve_wilson,
+    'eller': carve_eller,
+    'binary_tree': carve_binary_tree,
+}
+MAZE_ALGORITHM = 'dfs'
+
+def algorithm_for_level(spec, level):
+    # spec: one MAZE_GENERATORS name, or a comma-separated list cycled through by level
+    names = spec.split(',')
+    return names[(level - 1) % len(names)]
+
+# Maze generation (grid of walkable cells)
+def generate_maze(level, rng=None, algorithm=MAZE_ALGORITHM):
+    """
+    Create a boolean grid where 0 = wall, 1 = free/path.
+    Difficulty increases with level by making fewer carved cells.
+    The maze is carved on a cell grid (odd indices are passages) by the
+    MAZE_GENERATORS entry named by algorithm (randomized DFS by default).
+    The carved maze is a tree, so a cell disconnects start from exit exactly
+    when it lies on their one connecting path; extra walls skip those cells
+    and every level is solvable without retries.
+    All randomness comes from rng (a random.Random, e.g. from level_rng());
+    without one the global random module is used.
+    """
+    if rng is None:
+        rng = random
+    w = GRID_COLS
+    h = GRID_ROWS
+    # Make grid full walls first
+    grid = Grid(w, h)
+    cells = grid.cells
+    start_x = 1
+    start_y = 1
+    carve_chance = max(1, 100 - min(60, level))  # higher level -> smaller carve_chance? We'll tune below
+    MAZE_GENERATORS[algorithm](grid, rng)
+
+    # With an even width/height the exit isn't on the odd lattice: run a corridor
+    # to it from the nearest lattice cell (keeps the maze a tree)
+    exit_x, exit_y = w-2, h-2
+    lx = exit_x if exit_x % 2 else exit_x - 1
+    ly = exit_y if exit_y % 2 else exit_y - 1
+    for x in range(lx, exit_x + 1):
+        cells[ly*w + x] = 1
+    for y in range(ly, exit_y + 1):
+        cells[y*w + exit_x] = 1
+
+    # cells on the start-exit path are never blocked
+    protected = {y*w + x for x, y in bfs_path(grid, (start_x, start_y), (exit_x, exit_y))}
+
     # Increase difficulty: randomly add extra walls depending on level
     # level 1: few extra blocks, level 100: many extra blocks
     extra_block_chance = min(35, (level - 1) // 3 + 3)  # up to ~35%
     for ry in range(1, h-1):
         for rx in range(1, w-1):
-            # don't block start/end
-            if (rx, ry) in [(1,1), (w-2, h-2)]:
-                continue
-            if grid[ry][rx] == 1 and random.randint(1,100) <= extra_block_chance:
-                grid[ry][rx] = 0
+            i = ry*w + rx
+            if cells[i] == 1 and i not in protected and rng.randint(1,100) <= extra_block_chance:
+                cells[i] = 0
 
     # Guarantee border walls
-    for x in range(w):
-        grid[0][x] = 0
-        grid[h-1][x] = 0
-    for y in range(h):
-        grid[y][0] = 0
-        grid[y][w-1] = 0
+    grid.seal_border()
 
     return grid
 
@@ -204,8 +735,8 @@ def grid_to_pixel(gx, gy):
 
 # Convert pixel pos to grid coord
 def pixel_to_grid(px, py):
-    gx = (px - OFFSET_X) // TILE
-    gy = (py - OFFSET_Y) // TILE
+    gx = int((px - OFFSET_X) // TILE)
+    gy = int((py - OFFSET_Y) // TILE)
     # clamp
     gx = max(0, min(GRID_COLS-1, gx))
     gy = max(0, min(GRID_ROWS-1, gy))
@@ -214,134 +745,1279 @@ def pixel_to_grid(px, py):
 # Draw UI button
 def draw_button(text, rect, color_bg, color_text=WHITE):
     pygame.draw.rect(screen, color_bg, rect)
-    txt = font.render(text, True, color_text)
+    txt = render_text(font, text, color_text)
     tw, th = txt.get_size()
     screen.blit(txt, (rect.x + (rect.w - tw)//2, rect.y + (rect.h - th)//2))
 
+# 4-neighbour step order shared by the pathfinders
+DIRS = [(1,0),(-1,0),(0,1),(0,-1)]
+
 # BFS pathfinding on grid from enemy to player cell
 def bfs_path(grid, start, goal):
     if start == goal:
         return [start]
-    w = GRID_COLS
-    h = GRID_ROWS
+    if isinstance(grid, BitGrid):
+        return bit_bfs_path(grid, start, goal)
+    grid = as_grid(grid)
+    if not grid.interior(*start) or not grid.interior(*goal):
+        return None
+    cells = grid.cells
+    deltas = grid.deltas
+    s = grid.index(*start)
+    g = grid.index(*goal)
     q = deque()
-    q.append(start)
-    came = {start: None}
-    dirs = [(1,0),(-1,0),(0,1),(0,-1)]
+    q.append(s)
+    came = [-2] * len(cells)
+    came[s] = -1
     while q:
         cur = q.popleft()
-        if cur == goal:
+        if cur == g:
             break
-        cx, cy = cur
-        for dx,dy in dirs:
-            nx, ny = cx+dx, cy+dy
-            if 0 <= nx < w and 0 <= ny < h and grid[ny][nx] == 1 and (nx,ny) not in came:
-                came[(nx,ny)] = cur
-                q.append((nx,ny))
-    if goal not in came:
+        for d in deltas:
+            n = cur + d
+            if cells[n] == 1 and came[n] == -2:
+                came[n] = cur
+                q.append(n)
+    if came[g] == -2:
         return None
     # reconstruct path
     path = []
-    cur = goal
-    while cur:
-        path.append(cur)
+    cur = g
+    while cur != -1:
+        path.append(grid.cell(cur))
         cur = came[cur]
     path.reverse()
     return path
 
+# BFS distance field: steps from root to every cell (-1 = unreachable), flat-indexed
+def distance_field(grid, root):
+    grid = as_grid(grid)
+    cells = grid.cells
+    deltas = grid.deltas
+    dist = [-1] * len(cells)
+    if not grid.interior(*root):
+        return dist
+    r = grid.index(*root)
+    dist[r] = 0
+    q = deque()
+    q.append(r)
+    while q:
+        cur = q.popleft()
+        d = dist[cur] + 1
+        for delta in deltas:
+            n = cur + delta
+            if cells[n] == 1 and dist[n] < 0:
+                dist[n] = d
+                q.append(n)
+    return dist
+
+# Chase engine: one distance field rooted at the player serves every enemy
+class ChaseField:
+    """
+    Keeps a distance field rooted at the target cell (normally the player).
+    The field is rebuilt only when the root cell or the grid changes, so any
+    number of enemies can read their next step per frame in O(1).
+    """
+    def __init__(self):
+        self.source = None  # grid object passed by the caller (may be a legacy list grid)
+        self.grid = None
+        self.root = None
+        self.dist = None
+
+    def update(self, grid, root):
+        if grid is self.source and root == self.root:
+            return
+        self.source = grid
+        self.grid = as_grid(grid)
+        self.root = root
+        self.dist = distance_field(self.grid, root)
+
+    def invalidate(self):
+        self.source = None
+        self.grid = None
+        self.root = None
+        self.dist = None
+
+    def wall_changed(self, cell):
+        self.invalidate()
+
+    def next_step(self, cell):
+        # neighbour one step closer to the root, or None if unreachable / already there
+        grid = self.grid
+        if not grid.interior(*cell):
+            return None
+        i = grid.index(*cell)
+        d = self.dist[i]
+        if d <= 0:
+            return None
+        for delta in grid.deltas:
+            if self.dist[i + delta] == d - 1:
+                return grid.cell(i + delta)
+        return None
+
+# A* on the flat grid: Manhattan heuristic, binary heap, same call shape as bfs_path
+def astar_path(grid, start, goal):
+    if start == goal:
+        return [start]
+    grid = as_grid(grid)
+    if not grid.interior(*start) or not grid.interior(*goal):
+        return None
+    cells = grid.cells
+    deltas = grid.deltas
+    stride = grid.stride
+    s = grid.index(*start)
+    g = grid.index(*goal)
+    if cells[g] != 1:
+        return None
+    gx, gy = goal
+    came = [-2] * len(cells)
+    cost = {s: 0}
+    came[s] = -1
+    heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+    while heap:
+        f, c, cur = heapq.heappop(heap)
+        if cur == g:
+            break
+        if c > cost[cur]:
+            continue  # stale heap entry
+        c += 1
+        for d in deltas:
+            n = cur + d
+            if cells[n] == 1 and c < cost.get(n, c + 1):
+                cost[n] = c
+                came[n] = cur
+                h = abs(n % stride - gx) + abs(n // stride - gy)
+                heapq.heappush(heap, (c + h, c, n))
+    if came[g] == -2:
+        return None
+    path = []
+    cur = g
+    while cur != -1:
+        path.append(grid.cell(cur))
+        cur = came[cur]
+    path.reverse()
+    return path
+
+# Jump point search (4-connected): A* over jump points only, straight runs skipped
+def jps_path(grid, start, goal):
+    if start == goal:
+        return [start]
+    grid = as_grid(grid)
+    if not grid.interior(*start) or not grid.interior(*goal):
+        return None
+    cells = grid.cells
+    stride = grid.stride
+    s = grid.index(*start)
+    g = grid.index(*goal)
+    if cells[g] != 1:
+        return None
+    gx, gy = goal
+
+    def jump_h(n, d):
+        # run sideways until the goal or a cell with a newly opened row above/below
+        while True:
+            n += d
+            if cells[n] != 1:
+                return -1
+            if n == g:
+                return n
+            b = n - d
+            if (cells[n - stride] == 1 and cells[b - stride] != 1) or (cells[n + stride] == 1 and cells[b + stride] != 1):
+                return n
+
+    def jump_v(n, v):
+        # run up/down; any cell whose horizontal scans find a jump point is itself one
+        while True:
+            n += v
+            if cells[n] != 1:
+                return -1
+            if n == g:
+                return n
+            b = n - v
+            if (cells[n - 1] == 1 and cells[b - 1] != 1) or (cells[n + 1] == 1 and cells[b + 1] != 1):
+                return n
+            if jump_h(n, 1) >= 0 or jump_h(n, -1) >= 0:
+                return n
+
+    came = {s: -1}
+    cost = {s: 0}
+    closed = set()
+    heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+    while heap:
+        f, c, cur = heapq.heappop(heap)
+        if cur == g:
+            break
+        if cur in closed:
+            continue
+        closed.add(cur)
+        parent = came[cur]
+        if parent < 0:
+            dirs = (1, -1, stride, -stride)
+        elif cur // stride == parent // stride:
+            d = 1 if cur > parent else -1
+            dirs = (d, stride, -stride)  # horizontal arrival: keep going, or turn
+        else:
+            v = stride if cur > parent else -stride
+            dirs = (v, 1, -1)            # vertical arrival: keep going, or turn
+        for d in dirs:
+            if cells[cur + d] != 1:
+                continue
+            n = jump_h(cur, d) if d in (1, -1) else jump_v(cur, d)
+            if n < 0 or n in closed:
+                continue
+            nc = c + (abs(n - cur) if d in (1, -1) else abs(n - cur) // stride)
+            if nc < cost.get(n, nc + 1):
+                cost[n] = nc
+                came[n] = cur
+                heapq.heappush(heap, (nc + abs(n % stride - gx) + abs(n // stride - gy), nc, n))
+    if g not in came:
+        return None
+    # expand the straight segments between jump points back into cells
+    points = []
+    cur = g
+    while cur != -1:
+        points.append(cur)
+        cur = came[cur]
+    points.reverse()
+    path = [start]
+    for a, b in zip(points, points[1:]):
+        step = (1 if b > a else -1) if a // stride == b // stride else (stride if b > a else -stride)
+        while a != b:
+            a += step
+            path.append(grid.cell(a))
+    return path
+
+# Corridor graph: runs of degree-2 cells collapsed into weighted edges between junctions
+class CorridorGraph:
+    """
+    Junctions and dead ends (open cells without exactly two open neighbours)
+    become nodes; the corridor cells between two nodes become one edge
+    weighted by its length. path() runs Dijkstra over the nodes only and
+    expands the edges it used back into cells, so search cost scales with the
+    number of junctions rather than cells. A corridor that loops with no
+    junction on it gets one of its cells promoted to a node.
+    """
+    def __init__(self, grid):
+        self.source = grid
+        grid = as_grid(grid)
+        self.grid = grid
+        cells = grid.cells
+        deltas = grid.deltas
+        degree = [0] * len(cells)
+        for i, c in enumerate(cells):
+            if c == 1:
+                degree[i] = sum(1 for d in deltas if cells[i + d] == 1)
+        self.nodes = {i for i, c in enumerate(cells) if c == 1 and degree[i] != 2}
+        self.edges = []          # (a, b, corridor cells from a to b as flat indices)
+        self.adj = {n: [] for n in self.nodes}
+        self.where = {}          # corridor cell -> (edge id, position in the corridor)
+        for n in list(self.nodes):
+            self.trace(n)
+        for i, c in enumerate(cells):
+            if c == 1 and i not in self.nodes and i not in self.where:
+                # left over: a loop with no junction on it
+                self.nodes.add(i)
+                self.adj[i] = []
+                self.trace(i)
+
+    def trace(self, n):
+        # follow every corridor leaving node n that has not been recorded yet
+        cells = self.grid.cells
+        deltas = self.grid.deltas
+        for d in deltas:
+            first = n + d
+            if cells[first] != 1 or first in self.where:
+                continue
+            if first in self.nodes:
+                if n < first:  # adjacent nodes: record the empty edge once
+                    self.add_edge(n, first, [])
+                continue
+            run = []
+            prev, cur = n, first
+            while cur not in self.nodes:
+                run.append(cur)
+                nxt = next(cur + e for e in deltas if cells[cur + e] == 1 and cur + e != prev)
+                prev, cur = cur, nxt
+            self.add_edge(n, cur, run)
+
+    def add_edge(self, a, b, run):
+        e = len(self.edges)
+        self.edges.append((a, b, run))
+        for k, i in enumerate(run):
+            self.where[i] = (e, k)
+        w = len(run) + 1
+        self.adj[a].append((b, w, e))
+        if b != a:
+            self.adj[b].append((a, w, e))
+
+    def ends(self, i):
+        # ways out of cell i: [(node, steps, flat cells walked after i, ending at node)]
+        if i in self.nodes:
+            return [(i, 0, [])]
+        e, k = self.where[i]
+        a, b, run = self.edges[e]
+        return [(a, k + 1, run[k - 1::-1] + [a] if k else [a]),
+                (b, len(run) - k, run[k + 1:] + [b])]
+
+    def path(self, start, goal):
+        grid = self.grid
+        if start == goal:
+            return [start]
+        if not grid.interior(*start) or not grid.interior(*goal):
+            return None
+        s = grid.index(*start)
+        g = grid.index(*goal)
+        if grid.cells[s] != 1 or grid.cells[g] != 1:
+            return None
+        best, best_tail, best_node = None, None, None
+        if s not in self.nodes and g not in self.nodes and self.where[s][0] == self.where[g][0]:
+            # same corridor: walk it directly (a route around through the nodes may still win)
+            e, ks = self.where[s]
+            kg = self.where[g][1]
+            run = self.edges[e][2]
+            best = abs(ks - kg)
+            best_tail = run[ks + 1:kg + 1] if kg > ks else run[kg:ks][::-1]
+        # goal entry points: node -> (steps from node to goal, cells after node)
+        targets = {}
+        for node, steps, walk in self.ends(g):
+            tail = walk[-2::-1] + [g] if walk else []
+            if node not in targets or steps < targets[node][0]:
+                targets[node] = (steps, tail)
+        cost = {}
+        came = {}
+        heap = []
+        for node, steps, walk in self.ends(s):
+            if steps < cost.get(node, steps + 1):
+                cost[node] = steps
+                came[node] = (None, walk)
+                heapq.heappush(heap, (steps, node))
+        while heap:
+            c, n = heapq.heappop(heap)
+            if best is not None and c >= best:
+                break
+            if c > cost[n]:
+                continue
+            if n in targets:
+                total = c + targets[n][0]
+                if best is None or total < best:
+                    best, best_tail, best_node = total, targets[n][1], n
+            for m, w, e in self.adj[n]:
+                nc = c + w
+                if nc < cost.get(m, nc + 1):
+                    cost[m] = nc
+                    came[m] = (n, e)
+                    heapq.heappush(heap, (nc, m))
+        if best is None:
+            return None
+        flat = [s]
+        if best_node is not None:
+            chain = []
+            n = best_node
+            while True:
+                prev, via = came[n]
+                if prev is None:
+                    chain.append(via)  # cells from the start to its first node
+                    break
+                a, b, run = self.edges[via]
+                chain.append((run if prev == a else run[::-1]) + [n])
+                n = prev
+            for part in reversed(chain):
+                flat.extend(part)
+        flat.extend(best_tail)
+        return [grid.cell(i) for i in flat]
+
+def corridor_path(grid, start, goal):
+    # bfs_path call shape for one-off searches; CorridorChaser keeps its graph between searches
+    return CorridorGraph(grid).path(start, goal)
+
+# Pathfinders share the bfs_path call shape: (grid, start, goal) -> list of cells or None
+PATHFINDERS = {
+    'bfs': bfs_path,
+    'astar': astar_path,
+    'jps': jps_path,
+    'corridor': corridor_path,
+}
+
+class PathChaser:
+    """
+    Same interface as ChaseField, backed by a point-to-point search. The last
+    path is reused while the grid and target stay put and the enemy is on it,
+    so a search runs only when the target moves or the enemy strays.
+    """
+    def __init__(self, search):
+        self.search = search
+        self.source = None
+        self.root = None
+        self.path = None
+        self.pos = {}  # cell -> index in path
+
+    def update(self, grid, root):
+        if grid is self.source and root == self.root:
+            return
+        self.source = grid
+        self.root = root
+        self.path = None
+        self.pos = {}
+
+    def invalidate(self):
+        self.source = None
+        self.root = None
+        self.path = None
+        self.pos = {}
+
+    def wall_changed(self, cell):
+        self.path = None
+        self.pos = {}
+
+    def next_step(self, cell):
+        i = self.pos.get(cell)
+        if i is None:
+            path = self.search(self.source, cell, self.root)
+            if not path:
+                return None
+            self.path = path
+            self.pos = {c: k for k, c in enumerate(path)}
+            i = 0
+        if i + 1 < len(self.path):
+            return self.path[i + 1]
+        return None
+
+class CorridorChaser(PathChaser):
+    """
+    PathChaser over a CorridorGraph it owns. The graph is built on the first
+    search and kept until the chaser sees another grid object or is told a
+    wall changed, so in-place edits never search a stale graph.
+    """
+    def __init__(self):
+        PathChaser.__init__(self, self.graph_path)
+        self.graph = None
+
+    def graph_path(self, grid, start, goal):
+        if self.graph is None or self.graph.source is not grid:
+            self.graph = CorridorGraph(grid)
+        return self.graph.path(start, goal)
+
+    def wall_changed(self, cell):
+        PathChaser.wall_changed(self, cell)
+        self.graph = None
+
+    def invalidate(self):
+        PathChaser.invalidate(self)
+        self.graph = None
+
+# Path repair: how many one-cell extensions a RepairChaser accepts before searching afresh
+PATH_REPAIR_SLACK = 4
+
+class RepairChaser:
+    """
+    Keeps one enemy -> player path and repairs it in place instead of searching
+    again. A one-cell player move trims the path (player stepped back along it)
+    or extends it by that cell, shortcutting to the earliest path cell next to
+    the player; a wall dropped on the path is bridged with a local search from
+    the cell before it to the first path cell after it. In perfect mazes the
+    repaired path is exactly the shortest; with loops it may run long, so after
+    `slack` extensions the next step searches from scratch.
+    """
+    def __init__(self, search=bfs_path, slack=PATH_REPAIR_SLACK):
+        self.search = search
+        self.slack = slack
+        self.source = None
+        self.grid = None
+        self.root = None
+        self.path = None
+        self.pos = {}   # cell -> index in path
+        self.extended = 0
+
+    def update(self, grid, root):
+        if grid is not self.source:
+            self.source = grid
+            self.grid = as_grid(grid)
+            self.root = root
+            self.path = None
+            return
+        if root == self.root:
+            return
+        self.root = root
+        path = self.path
+        if not path or abs(root[0] - path[-1][0]) + abs(root[1] - path[-1][1]) != 1:
+            self.path = None
+            return
+        i = self.pos.get(root)
+        if i is None:
+            # earliest path cell next to the new root; cut the path there and step onto the root
+            x, y = root
+            i = min((self.pos.get((x + dx, y + dy), len(path)) for dx, dy in DIRS))
+            self.truncate(i)
+            self.pos[root] = len(path)
+            path.append(root)
+            self.extended += 1
+            if self.extended > self.slack:
+                self.path = None
+        else:
+            self.truncate(i)
+
+    def truncate(self, i):
+        # drop everything after path[i]
+        path = self.path
+        for c in path[i + 1:]:
+            del self.pos[c]
+        del path[i + 1:]
+
+    def wall_changed(self, cell):
+        if not self.path:
+            return
+        i = self.pos.get(cell)
+        if self.grid.is_open(*cell):
+            self.path = None  # an opened wall can shorten the path anywhere
+        elif i is not None:
+            if i == 0 or i == len(self.path) - 1:
+                self.path = None
+                return
+            self.bridge(i)
+
+    def bridge(self, i):
+        # BFS from path[i-1] to the nearest path cell beyond i, splice the detour in
+        grid = self.grid
+        cells = grid.cells
+        path = self.path
+        index_of = {grid.index(*c): k for k, c in enumerate(path) if k > i}
+        s = grid.index(*path[i - 1])
+        came = {s: -1}
+        q = deque([s])
+        hit = -1
+        while q and hit < 0:
+            cur = q.popleft()
+            for d in grid.deltas:
+                n = cur + d
+                if cells[n] == 1 and n not in came:
+                    came[n] = cur
+                    if n in index_of:
+                        hit = n
+                        break
+                    q.append(n)
+        if hit < 0:
+            self.path = None
+            return
+        detour = []
+        cur = came[hit]
+        while cur != s:
+            detour.append(grid.cell(cur))
+            cur = came[cur]
+        detour.reverse()
+        # with loops the detour can cross the path before i-1: resume from the last such
+        # cell so every cell appears once (pos must stay one-to-one)
+        pos = self.pos
+        k, j = i - 1, 0
+        for n, c in enumerate(detour):
+            if c in pos and pos[c] < i - 1:
+                k, j = pos[c], n + 1
+        self.path = path[:k + 1] + detour[j:] + path[index_of[hit]:]
+        self.pos = {c: n for n, c in enumerate(self.path)}
+        if len(self.pos) != len(self.path):
+            self.path = None  # never steer along a path that repeats a cell
+            return
+        self.extended += 1
+
+    def invalidate(self):
+        self.source = None
+        self.grid = None
+        self.root = None
+        self.path = None
+        self.pos = {}
+
+    def next_step(self, cell):
+        i = self.pos.get(cell) if self.path else None
+        if i is None:
+            path = self.search(self.source, cell, self.root)
+            if not path:
+                return None
+            self.path = path
+            self.pos = {c: k for k, c in enumerate(path)}
+            self.extended = 0
+            i = 0
+        if i + 1 < len(self.path):
+            return self.path[i + 1]
+        return None
+
+# All-pairs next hops for small boards: one table per level, built when the level is prepared
+#
+# Cache file layout (little-endian): "MZHP", u16 width, u16 height, u32 open cells,
+# then open_cells^2 u16 entries (row = target cell, column = current cell)
+HOP_MAGIC = b'MZHP'
+HOP_HEADER = struct.Struct('<4sHHI')
+NO_HOP = 0xFFFF
+
+class NextHopTable:
+    """
+    Next cell toward any target from any cell, as one table lookup. Building
+    runs a BFS per open cell (n^2 entries, so meant for boards of a few hundred
+    cells) and picks neighbours in the same order as ChaseField.next_step.
+    With cache_dir the table is stored per maze layout and reloaded next time.
+    Implements the chaser interface; update() only moves a row offset.
+    """
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.source = None
+        self.grid = None
+        self.ids = None     # flat index -> open cell id, -1 for walls
+        self.cells = None   # open cell id -> (x, y)
+        self.hops = None
+        self.root = None
+        self.base = -1      # offset of the current target's row
+
+    def update(self, grid, root):
+        if grid is not self.source:
+            self.load(grid)
+        self.root = root
+        k = self.ids[self.grid.index(*root)] if self.grid.interior(*root) else -1
+        self.base = k * len(self.cells) if k >= 0 else -1
+
+    def load(self, grid, write_cache=True):
+        self.source = grid
+        g = self.grid = as_grid(grid)
+        opened = [i for i, c in enumerate(g.cells) if c == 1]
+        self.ids = [-1] * len(g.cells)
+        for k, i in enumerate(opened):
+            self.ids[i] = k
+        self.cells = [g.cell(i) for i in opened]
+        path = None
+        if self.cache_dir:
+            key = hashlib.sha1(struct.pack('<HH', g.width, g.height) + bytes(g.cells)).hexdigest()
+            path = os.path.join(self.cache_dir, key + '.hop')
+            self.hops = self.read(path, len(opened))
+            if self.hops is not None:
+                return
+        self.hops = self.build(opened)
+        if path and write_cache:
+            self.write(path)
+
+    def build(self, opened):
+        g = self.grid
+        ids = self.ids
+        deltas = g.deltas
+        n = len(opened)
+        hops = array('H', [NO_HOP]) * (n * n)
+        for r, ri in enumerate(opened):
+            dist = distance_field(g, g.cell(ri))
+            base = r * n
+            for k, i in enumerate(opened):
+                d = dist[i] - 1
+                if d >= 0:
+                    for delta in deltas:
+                        if dist[i + delta] == d:
+                            hops[base + k] = ids[i + delta]
+                            break
+        return hops
+
+    def read(self, path, n):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        g = self.grid
+        if len(data) != HOP_HEADER.size + 2 * n * n or HOP_HEADER.unpack_from(data) != (HOP_MAGIC, g.width, g.height, n):
+            return None
+        hops = array('H')
+        hops.frombytes(data[HOP_HEADER.size:])
+        if sys.byteorder == 'big':
+            hops.byteswap()
+        return hops
+
+    def write(self, path):
+        # written under a temporary name and renamed, so a prefetch thread never leaves half a file
+        hops = self.hops
+        if sys.byteorder == 'big':
+            hops = array('H', hops)
+            hops.byteswap()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(HOP_HEADER.pack(HOP_MAGIC, self.grid.width, self.grid.height, len(self.cells)))
+            hops.tofile(f)
+        os.replace(tmp, path)
+
+    def wall_changed(self, cell):
+        if self.source is None:
+            return
+        # rebuild for the edited layout without caching it: runtime edits are one-off layouts
+        self.load(self.source, write_cache=False)
+        self.update(self.source, self.root)
+
+    def invalidate(self):
+        self.source = None
+        self.base = -1
+
+    def next_step(self, cell):
+        if self.base < 0 or not self.grid.interior(*cell):
+            return None
+        k = self.ids[self.grid.index(*cell)]
+        if k < 0:
+            return None
+        h = self.hops[self.base + k]
+        return self.cells[h] if h != NO_HOP else None
+
+# Enemy steering: 'field' is the shared distance field, 'repair' a RepairChaser,
+# 'table' a NextHopTable, 'corridor' a CorridorChaser, others a PathChaser over PATHFINDERS
+ENEMY_PATHFINDER = 'field'
+
+def make_chaser(pathfinder=ENEMY_PATHFINDER, cache_dir=None):
+    # cache_dir: where a 'table' chaser keeps its per-maze next-hop files (None = no cache)
+    if pathfinder == 'field':
+        return ChaseField()
+    if pathfinder == 'repair':
+        return RepairChaser()
+    if pathfinder == 'table':
+        return NextHopTable(cache_dir)
+    if pathfinder == 'corridor':
+        return CorridorChaser()
+    return PathChaser(PATHFINDERS[pathfinder])
+
+# Maze packs: all levels generated offline into one file, read back through mmap
+#
+# Layout (little-endian):
+#   header  "MZPK", u16 version, u16 reserved, u16 width, u16 height, u32 count, u64 game seed
+#   record  u16 level, u16 flags, u32 start-exit path length, u64 level seed,
+#           then height rows of ceil(width/8) bytes; bit x of a row is cell x (1 = path)
+# Records are fixed-size, so level N sits at a computed offset and needs no index.
+PACK_MAGIC = b'MZPK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sHHHHIQ')
+PACK_RECORD = struct.Struct('<HHIQ')
+PACK_SOLVABLE = 1
+
+# byte -> 8 cell bytes, least significant bit first
+_BIT_EXPAND = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+def build_maze_pack(path, game_seed, levels=MAX_LEVEL, algorithm=MAZE_ALGORITHM):
+    w = GRID_COLS
+    h = GRID_ROWS
+    with open(path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, w, h, levels, game_seed))
+        for lvl in range(1, levels + 1):
+            seed = level_seed(game_seed, lvl)
+            grid = generate_maze(lvl, random.Random(seed), algorithm_for_level(algorithm, lvl))
+            path_cells = bfs_path(grid, (1,1), (w-2, h-2))
+            flags = PACK_SOLVABLE if path_cells else 0
+            path_len = len(path_cells) - 1 if path_cells else 0
+            f.write(PACK_RECORD.pack(lvl, flags, path_len, seed))
+            f.write(BitGrid.from_grid(grid).row_bytes())
+
+class MazePack:
+    """
+    Read-only view of a maze pack file. The file is memory-mapped, so opening
+    it reads only the header; grid(level) expands one record into a Grid,
+    bit_grid(level) reads it straight into a BitGrid and grid_bits(level)
+    exposes the packed rows without copying.
+    """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.width, self.height, self.count, self.seed = PACK_HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path}: not a version {PACK_VERSION} maze pack")
+        self.row_bytes = (self.width + 7) // 8
+        self.record_size = PACK_RECORD.size + self.height * self.row_bytes
+        if len(self.map) < PACK_HEADER.size + self.count * self.record_size:
+            raise ValueError(f"{path}: truncated maze pack")
+
+    def offset(self, level):
+        if not 1 <= level <= self.count:
+            raise IndexError(f"level {level} not in pack (1..{self.count})")
+        return PACK_HEADER.size + (level - 1) * self.record_size
+
+    def info(self, level):
+        # (level seed, flags, start-exit path length)
+        lvl, flags, path_len, seed = PACK_RECORD.unpack_from(self.map, self.offset(level))
+        return seed, flags, path_len
+
+    def grid_bits(self, level):
+        start = self.offset(level) + PACK_RECORD.size
+        return memoryview(self.map)[start:start + self.height * self.row_bytes]
+
+    def bit_grid(self, level):
+        bits = self.grid_bits(level)
+        rb = self.row_bytes
+        rows = [int.from_bytes(bits[y*rb:(y+1)*rb], 'little') for y in range(self.height)]
+        bits.release()
+        return BitGrid(self.width, self.height, rows)
+
+    def grid(self, level):
+        bits = self.grid_bits(level)
+        grid = Grid(self.width, self.height)
+        rb = self.row_bytes
+        for y in range(self.height):
+            row = b''.join([_BIT_EXPAND[b] for b in bits[y*rb:(y+1)*rb]])
+            grid.rows[y][:] = row[:self.width]
+        bits.release()
+        return grid
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+# Collision lookup: per level and entity size, a move test is two table reads and one cell read
+def corner_tiles(origin, length, tiles, size):
+    """
+    For every pixel p an entity of `size` can stand at along one axis, the tile
+    under its near inset corner (p + 2) and the distance to the tile under its
+    far corner (p + size - 2), clamped like pixel_to_grid. Positions outside
+    [origin - size, origin + length] map to the same tiles as the nearest end.
+    """
+    lo = origin - size
+    starts = []
+    spans = []
+    for p in range(lo, origin + length + 1):
+        a = max(0, min(tiles-1, (p + 2 - origin) // TILE))
+        b = max(0, min(tiles-1, (p + size - 2 - origin) // TILE))
+        starts.append(a)
+        spans.append(b - a)
+    return lo, starts, spans
+
+class BoxCollider:
+    """
+    Wall test for one entity size on one grid, equivalent to sampling the four
+    inset corners. blocks[k][i] is 1 when the four tiles at cell i and the
+    corner offsets selected by k are all open; k comes from the x/y tables.
+    """
+    def __init__(self, grid, size):
+        grid = as_grid(grid)
+        self.x_lo, self.col, xspans = corner_tiles(OFFSET_X, MAZE_PIXEL_WIDTH, grid.width, size)
+        self.y_lo, rows, yspans = corner_tiles(OFFSET_Y, MAZE_PIXEL_HEIGHT, grid.height, size)
+        self.row = [r * grid.stride for r in rows]
+        self.nx = len(self.col)
+        self.ny = len(self.row)
+        xs = sorted(set(xspans))
+        ys = sorted(set(yspans))
+        self.xkey = [xs.index(v) * len(ys) for v in xspans]
+        self.ykey = [ys.index(v) for v in yspans]
+        # cells are 0/1 bytes, so ANDing shifted copies of the buffer as one int is a per-cell AND
+        n = len(grid.cells)
+        allcells = int.from_bytes(grid.cells, 'little')
+        self.blocks = []
+        for ox in xs:
+            for oy in ys:
+                oy *= grid.stride
+                both = allcells & (allcells >> 8*ox) & (allcells >> 8*oy) & (allcells >> 8*(ox + oy))
+                self.blocks.append(both.to_bytes(n, 'little'))
+
+    def can_move_to(self, px, py):
+        i = int(px) - self.x_lo
+        j = int(py) - self.y_lo
+        if i < 0:
+            i = 0
+        elif i >= self.nx:
+            i = self.nx - 1
+        if j < 0:
+            j = 0
+        elif j >= self.ny:
+            j = self.ny - 1
+        return self.blocks[self.xkey[i] + self.ykey[j]][self.col[i] + self.row[j]] == 1
+
+class CollisionMap:
+    # one BoxCollider per entity size, built on first use
+    def __init__(self, grid):
+        self.grid = grid
+        self.colliders = {}
+
+    def collider(self, size):
+        c = self.colliders.get(size)
+        if c is None:
+            c = self.colliders[size] = BoxCollider(self.grid, size)
+        return c
+
+# A level built ahead of time: grid plus data derived from it
+class PreparedLevel:
+    def __init__(self, level, grid, chase=None, surface=None, collision=None):
+        self.level = level
+        self.grid = grid
+        self.chase = chase          # chaser (see make_chaser) already rooted at the player start cell
+        self.surface = surface      # unconverted static maze surface, if rendering
+        self.collision = collision  # CollisionMap with the player/enemy sizes built
+
+# Background level preparation so a level change never generates inside the frame
+class LevelPrefetcher:
+    """
+    Runs build(seed, level) on a worker thread. take() hands over a finished
+    level or returns None while the worker is still busy; it never waits.
+    """
+    def __init__(self, build):
+        self.build = build
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+        self.pending = {}  # (seed, level) -> Future
+
+    def request(self, seed, level):
+        key = (seed, level)
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(self.build, seed, level)
+
+    def take(self, seed, level):
+        key = (seed, level)
+        fut = self.pending.get(key)
+        if fut is None:
+            self.request(seed, level)
+            return None
+        if not fut.done():
+            return None
+        del self.pending[key]
+        return fut.result()
+
+    def discard(self):
+        for fut in self.pending.values():
+            fut.cancel()
+        self.pending.clear()
+
+    def close(self):
+        self.discard()
+        self.executor.shutdown(wait=False)
+
+# Box overlap on whole pixels, same result as pygame.Rect.colliderect without building Rects
+def boxes_overlap(x1, y1, s1, x2, y2, s2):
+    x1 = int(x1)
+    y1 = int(y1)
+    x2 = int(x2)
+    y2 = int(y2)
+    return x1 < x2 + s2 and x2 < x1 + s1 and y1 < y2 + s2 and y2 < y1 + s1
+
+# Moving entities: player and main enemy
+class Entity:
+    """
+    A size x size box moving through the maze: top-left corner in pixels, the
+    same corner at the start of the last tick (for render interpolation), the
+    grid cell under its center, and its speed in pixels per tick. Slotted and
+    updated in place, so a tick allocates nothing per entity; rect is the
+    entity's own draw rect, moved by draw_rect() rather than rebuilt.
+    """
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'cell', 'size', 'speed', 'rect')
+
+    def __init__(self, size, speed, cell):
+        self.size = size
+        self.speed = speed
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.place(cell)
+
+    def place(self, cell):
+        # put the box centered on cell; a teleport, so nothing to interpolate
+        cx, cy = grid_to_pixel(*cell)
+        self.x = self.prev_x = cx - self.size//2
+        self.y = self.prev_y = cy - self.size//2
+        self.cell = cell
+
+    def snapshot(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def update_cell(self):
+        self.cell = pixel_to_grid(self.x + self.size//2, self.y + self.size//2)
+
+    def draw_rect(self, alpha=1.0):
+        # top-left corner blended alpha of the way from the previous tick
+        # (int(): Rect attributes round floats, the Rect constructor truncates them)
+        r = self.rect
+        r.x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        r.y = int(self.prev_y + (self.y - self.prev_y) * alpha)
+        return r
+
+    def overlaps(self, other):
+        return boxes_overlap(self.x, self.y, self.size, other.x, other.y, other.size)
+
+# Several enemies: extra ones live in an EnemySwarm and steer from one shared flow field
+def steer_step(x, y, size, speed, cell, collider):
+    # move a size x size box at (x, y) up to speed pixels toward the center of cell, axis by axis
+    nx_px, ny_px = grid_to_pixel(*cell)
+    dir_x = nx_px - (x + size//2)
+    dir_y = ny_px - (y + size//2)
+    if dir_x != 0 or dir_y != 0:
+        dist = max(1, (dir_x**2 + dir_y**2)**0.5)
+        new_x = x + speed * dir_x / dist
+        new_y = y + speed * dir_y / dist
+        if collider.can_move_to(new_x, y):
+            x = new_x
+        if collider.can_move_to(x, new_y):
+            y = new_y
+    return x, y
+
+def enemies_for_level(level):
+    # multi-enemy mode: one more enemy every ENEMY_LEVEL_STEP levels
+    return min(MAX_ENEMIES, 1 + (level - 1) // ENEMY_LEVEL_STEP)
+
+def spawn_cells(grid, start, count, exclude=()):
+    # count open cells spread over the far half of the maze, as seen from start
+    grid = as_grid(grid)
+    dist = distance_field(grid, start)
+    far = max(dist)
+    cells = sorted((i for i, d in enumerate(dist) if d * 2 >= far and grid.cell(i) not in exclude),
+                   key=lambda i: (-dist[i], i))
+    step = max(1, len(cells) // max(1, count))
+    return [grid.cell(i) for i in cells[::step][:count]]
+
+# Broad phase for catches: entities bucketed by the tile under their center
+class TileHash:
+    """
+    Maps a grid cell (as returned by pixel_to_grid) to the items whose center
+    is on it. Items are moved between buckets only when their tile changes,
+    and near() yields just the items on tiles around a cell, so an overlap
+    test looks at a few neighbours instead of every entity.
+    """
+    def __init__(self):
+        self.buckets = {}
+
+    def clear(self):
+        self.buckets.clear()
+
+    def add(self, cell, item):
+        bucket = self.buckets.get(cell)
+        if bucket is None:
+            self.buckets[cell] = [item]
+        else:
+            bucket.append(item)
+
+    def move(self, item, old, new):
+        if old == new:
+            return
+        bucket = self.buckets[old]
+        bucket.remove(item)
+        if not bucket:
+            del self.buckets[old]
+        self.add(new, item)
+
+    def near(self, cell, radius=1):
+        # items on every tile within radius of cell (Chebyshev distance)
+        cx, cy = cell
+        buckets = self.buckets
+        for y in range(cy - radius, cy + radius + 1):
+            for x in range(cx - radius, cx + radius + 1):
+                bucket = buckets.get((x, y))
+                if bucket:
+                    yield from bucket
+
+class EnemySwarm:
+    """
+    Enemies stored as parallel lists (structure of arrays) rather than one
+    object each. step() reads every enemy's next cell from the same chaser,
+    so with a ChaseField the per-tick cost is one flood fill when the player
+    changes cell plus O(enemies), however many enemies there are. Enemies
+    are also kept in a TileHash, so catches() only tests the ones nearby.
+    """
+    def __init__(self):
+        self.x = []
+        self.y = []
+        self.prev_x = []
+        self.prev_y = []
+        self.cells = []
+        self.speeds = []
+        self.rects = []  # draw rects, reused frame to frame
+        self.tiles = TileHash()  # enemy index by cells[i]
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, cells, speed=ENEMY_SPEED):
+        # refills the lists in place; the arrays keep their identity across respawns
+        half = ENEMY_SIZE//2
+        self.x[:] = [grid_to_pixel(*c)[0] - half for c in cells]
+        self.y[:] = [grid_to_pixel(*c)[1] - half for c in cells]
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.cells[:] = cells
+        self.speeds[:] = [speed] * len(cells)
+        self.tiles.clear()
+        for i, c in enumerate(cells):
+            self.tiles.add(c, i)
+        del self.rects[len(cells):]
+        self.rects.extend(pygame.Rect(0, 0, ENEMY_SIZE, ENEMY_SIZE) for _ in range(len(cells) - len(self.rects)))
+
+    def snapshot(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def step(self, flow, collider):
+        # cells[i] is the tile under enemy i after the previous step (or its spawn cell)
+        xs, ys, cells, speeds, tiles = self.x, self.y, self.cells, self.speeds, self.tiles
+        half = ENEMY_SIZE//2
+        for i in range(len(xs)):
+            cell = cells[i]
+            nxt = flow.next_step(cell)
+            if nxt:
+                xs[i], ys[i] = steer_step(xs[i], ys[i], ENEMY_SIZE, speeds[i], nxt, collider)
+                moved = pixel_to_grid(xs[i] + half, ys[i] + half)
+                if moved != cell:
+                    tiles.move(i, cell, moved)
+                    cells[i] = moved
+
+    def catches(self, px, py, size):
+        # True if any enemy box overlaps the size x size box at (px, py); boxes narrower
+        # than a tile can only overlap from the same or an adjacent tile
+        xs, ys = self.x, self.y
+        reach = 1 + (size + ENEMY_SIZE) // (2 * TILE)
+        for i in self.tiles.near(pixel_to_grid(px + size//2, py + size//2), reach):
+            if boxes_overlap(px, py, size, xs[i], ys[i], ENEMY_SIZE):
+                return True
+        return False
+
+    def draw_rects(self, alpha=1.0):
+        xs, ys, pxs, pys = self.x, self.y, self.prev_x, self.prev_y
+        for i, r in enumerate(self.rects):
+            r.x = int(pxs[i] + (xs[i] - pxs[i]) * alpha)
+            r.y = int(pys[i] + (ys[i] - pys[i]) * alpha)
+        return self.rects
+
 # Game class holding state
 class MazeRunner:
-    def __init__(self):
+    def __init__(self, seed=None, prefetch=False, prerender=False, pack=None, algorithm=MAZE_ALGORITHM,
+                 pathfinder=ENEMY_PATHFINDER, hop_cache=None, multi_enemy=False):
         self.level = 1
         self.lives = START_LIVES
         self.state = "menu"  # 'menu', 'playing', 'game_over', 'win'
-        self.grid = generate_maze(self.level)
-        # player at (1,1) cell center
-        px, py = grid_to_pixel(1,1)
-        self.player_pos = [px - PLAYER_SIZE//2, py - PLAYER_SIZE//2]
-        # enemy at bottom-right cell
-        ex, ey = grid_to_pixel(GRID_COLS-2, GRID_ROWS-2)
-        self.enemy_pos = [ex - ENEMY_SIZE//2, ey - ENEMY_SIZE//2]
-        self.player_cell = (1,1)
-        self.enemy_cell = (GRID_COLS-2, GRID_ROWS-2)
+        # fixed seed replays the same mazes every game; otherwise each game draws a new one
+        # levels come from a MazePack when given (its seed is then fixed), else are generated
+        self.pack = pack
+        self.algorithm = algorithm  # generator name, or comma-separated names cycled per level
+        if pack is not None:
+            if (pack.width, pack.height) != (GRID_COLS, GRID_ROWS):
+                raise ValueError(f"maze pack is {pack.width}x{pack.height}, game grid is {GRID_COLS}x{GRID_ROWS}")
+            seed = pack.seed
+        self.fixed_seed = seed
+        self.seed = seed if seed is not None else new_game_seed()
+        self.grid = self.level_grid(self.seed, self.level)
+        # player at (1,1) cell center, enemy at bottom-right cell
+        self.player = Entity(PLAYER_SIZE, PLAYER_SPEED, (1,1))
+        self.enemy = Entity(ENEMY_SIZE, ENEMY_SPEED, (GRID_COLS-2, GRID_ROWS-2))
         self.target_cell = (GRID_COLS-2, GRID_ROWS-2)  # exit
         self.path_to_player = None
+        self.pathfinder = pathfinder  # enemy steering, see make_chaser
+        self.hop_cache = hop_cache    # directory for 'table' next-hop files
+        self.chase = make_chaser(pathfinder, hop_cache)
+        # multi-enemy mode adds enemies_for_level() - 1 swarm enemies next to the main one
+        self.multi_enemy = multi_enemy
+        self.swarm = EnemySwarm()
+        self.spawns = []
+        self.flow = self.chase
         self.pause = False
         self.show_debug = False
         self.touch_controls = True  # show on-screen arrows
         self.last_caught_time = 0
         self.level_transition_timer = 0
         self.button_clicked = False
+        # prefetch: build upcoming levels on a worker thread; prerender: include the maze surface
+        self.prerender = prerender
+        self.prefetcher = LevelPrefetcher(self.prepare_level) if prefetch else None
+        self.waiting_for_level = False
+        self.collision = None
+        self.grid_edits = 0  # bumped by set_wall so cached drawings of the grid know to rebuild
 
     def reset_positions(self):
-        px, py = grid_to_pixel(1,1)
-        self.player_pos = [px - PLAYER_SIZE//2, py - PLAYER_SIZE//2]
-        ex, ey = grid_to_pixel(GRID_COLS-2, GRID_ROWS-2)
-        self.enemy_pos = [ex - ENEMY_SIZE//2, ey - ENEMY_SIZE//2]
-        self.player_cell = (1,1)
-        self.enemy_cell = (GRID_COLS-2, GRID_ROWS-2)
-
-    def new_level(self, lvl):
-        self.level = lvl
-        self.grid = generate_maze(self.level)
+        self.player.place((1,1))
+        self.enemy.place((GRID_COLS-2, GRID_ROWS-2))
+        self.swarm.spawn(self.spawns)
+
+    def level_grid(self, seed, lvl):
+        if self.pack is not None and lvl <= self.pack.count:
+            return self.pack.grid(lvl)
+        return generate_maze(lvl, level_rng(seed, lvl), algorithm_for_level(self.algorithm, lvl))
+
+    def prepare_level(self, seed, lvl):
+        # safe to run off the main thread: touches no game state
+        grid = self.level_grid(seed, lvl)
+        chase = make_chaser(self.pathfinder, self.hop_cache)
+        chase.update(grid, (1,1))
+        surface = render_maze_surface(grid, convert=False) if self.prerender else None
+        collision = CollisionMap(grid)
+        collision.collider(PLAYER_SIZE)
+        collision.collider(ENEMY_SIZE)
+        return PreparedLevel(lvl, grid, chase, surface, collision)
+
+    def install_level(self, prepared):
+        self.level = prepared.level
+        self.grid = prepared.grid
+        self.spawns = []
+        if self.multi_enemy:
+            extra = enemies_for_level(self.level) - 1
+            self.spawns = spawn_cells(self.grid, (1,1), extra, exclude=((GRID_COLS-2, GRID_ROWS-2),)) if extra else []
         self.reset_positions()
         self.path_to_player = None
+        self.chase = prepared.chase or make_chaser(self.pathfinder, self.hop_cache)
+        # swarm enemies need a chaser every enemy can share; path chasers follow one enemy only
+        self.flow = self.chase if isinstance(self.chase, (ChaseField, NextHopTable)) else ChaseField()
+        self.collision = prepared.collision
+        if prepared.surface is not None:
+            prime_maze_surface(prepared.grid, prepared.surface)
+        if self.prefetcher and self.level < MAX_LEVEL:
+            self.prefetcher.request(self.seed, self.level + 1)
+
+    def start(self):
+        self.state = "playing"
+        self.lives = START_LIVES
+        self.waiting_for_level = False
+        if self.fixed_seed is None:
+            self.seed = new_game_seed()
+            if self.prefetcher:
+                self.prefetcher.discard()
+        self.install_level(self.prepare_level(self.seed, 1))
 
-    def update_player_cell(self):
-        gx, gy = pixel_to_grid(self.player_pos[0] + PLAYER_SIZE//2, self.player_pos[1] + PLAYER_SIZE//2)
-        self.player_cell = (gx, gy)
+    def new_level(self, lvl):
+        self.install_level(self.prepare_level(self.seed, lvl))
 
-    def update_enemy_cell(self):
-        gx, gy = pixel_to_grid(self.enemy_pos[0] + ENEMY_SIZE//2, self.enemy_pos[1] + ENEMY_SIZE//2)
-        self.enemy_cell = (gx, gy)
+    def advance_level(self):
+        # returns False while the prefetch worker is still building the next level
+        nxt = self.level + 1
+        if self.prefetcher:
+            prepared = self.prefetcher.take(self.seed, nxt)
+        else:
+            prepared = self.prepare_level(self.seed, nxt)
+        self.waiting_for_level = prepared is None
+        if prepared is None:
+            return False
+        self.install_level(prepared)
+        return True
+
+    def close(self):
+        if self.prefetcher:
+            self.prefetcher.close()
 
     def update(self, dt, input_dir):
-        # dt is delta time in seconds (unused but provided)
+        # one fixed simulation tick: dt is SIM_DT and speeds are pixels per tick
         if self.state != "playing":
             return
+        player = self.player
+        enemy = self.enemy
+        player.snapshot()
+        enemy.snapshot()
+        self.swarm.snapshot()
+        # hold on the exit tile until the next level has been handed over
+        if self.waiting_for_level and not self.advance_level():
+            return
 
         # move player with input_dir = (dx, dy) in pixels
         if input_dir:
             dx, dy = input_dir
-            new_x = self.player_pos[0] + dx
-            new_y = self.player_pos[1] + dy
+            new_x = player.x + dx
+            new_y = player.y + dy
             # collision: check the rectangle corners with grid walls
-            can_move_x = self.can_move_to(new_x, self.player_pos[1])
-            can_move_y = self.can_move_to(self.player_pos[0], new_y)
+            can_move_x = self.can_move_to(new_x, player.y)
+            can_move_y = self.can_move_to(player.x, new_y)
             if can_move_x:
-                self.player_pos[0] = new_x
+                player.x = new_x
             if can_move_y:
-                self.player_pos[1] = new_y
-
-        self.update_player_cell()
-        self.update_enemy_cell()
-
-        # enemy pathfinding toward player cell every few frames (or when player cell changes)
-        path = bfs_path(self.grid, self.enemy_cell, self.player_cell)
-        if path and len(path) >= 2:
-            # move enemy toward next cell center
-            next_cell = path[1]
-            nx_px, ny_px = grid_to_pixel(*next_cell)
-            # move enemy pixel-wise toward nx_px,ny_px with ENEMY_SPEED
-            ex_c = self.enemy_pos[0] + ENEMY_SIZE//2
-            ey_c = self.enemy_pos[1] + ENEMY_SIZE//2
-            dir_x = nx_px - ex_c
-            dir_y = ny_px - ey_c
-            # normalize to speed
-            if dir_x != 0 or dir_y != 0:
-                dist = max(1, (dir_x**2 + dir_y**2)**0.5)
-                vx = ENEMY_SPEED * dir_x / dist
-                vy = ENEMY_SPEED * dir_y / dist
-                # attempt move with collision checking
-                new_ex = self.enemy_pos[0] + vx
-                new_ey = self.enemy_pos[1] + vy
-                if self.can_move_to(new_ex, self.enemy_pos[1]):
-                    self.enemy_pos[0] = new_ex
-                if self.can_move_to(self.enemy_pos[0], new_ey):
-                    self.enemy_pos[1] = new_ey
+                player.y = new_y
+
+        player.update_cell()
+        enemy.update_cell()
+
+        # enemy steers from its chaser; it recomputes only when the player cell or grid changes
+        self.chase.update(self.grid, player.cell)
+        next_cell = self.chase.next_step(enemy.cell)
+        enemy_collider = self.collider(ENEMY_SIZE)
+        if next_cell:
+            # move enemy pixel-wise toward the next cell center at its speed
+            enemy.x, enemy.y = steer_step(enemy.x, enemy.y, enemy.size, enemy.speed, next_cell, enemy_collider)
+        if len(self.swarm):
+            if self.flow is not self.chase:
+                self.flow.update(self.grid, player.cell)
+            self.swarm.step(self.flow, enemy_collider)
 
         # check collision (catch)
-        if self.rects_collide(self.player_pos, PLAYER_SIZE, self.enemy_pos, ENEMY_SIZE):
+        if player.overlaps(enemy) or self.swarm.catches(player.x, player.y, player.size):
             # caught
             play_sound('caught')
             self.lives -= 1
@@ -355,42 +2031,37 @@ class MazeRunner:
                 self.reset_positions()
 
         # check exit reached (playerCell == targetCell bottom-right)
-        if self.player_cell == (GRID_COLS-2, GRID_ROWS-2):
+        if player.cell == (GRID_COLS-2, GRID_ROWS-2):
             play_sound('levelup')
             # next level
             if self.level < MAX_LEVEL:
-                self.level += 1
-                self.grid = generate_maze(self.level)
-                self.reset_positions()
+                self.advance_level()
             else:
                 self.state = "win"
                 stop_bg_music()
 
-    def rects_collide(self, pos1, size1, pos2, size2):
-        r1 = pygame.Rect(pos1[0], pos1[1], size1, size1)
-        r2 = pygame.Rect(pos2[0], pos2[1], size2, size2)
-        return r1.colliderect(r2)
+    def collider(self, size):
+        # BoxCollider for the current grid; tables are rebuilt if the grid was swapped
+        if self.collision is None or self.collision.grid is not self.grid:
+            self.collision = CollisionMap(self.grid)
+        return self.collision.collider(size)
 
-    def can_move_to(self, px, py):
-        # Check four corners for wall collision
-        w = PLAYER_SIZE
-        corners = [
-            (px + 2, py + 2),
-            (px + w - 2, py + 2),
-            (px + 2, py + w - 2),
-            (px + w - 2, py + w - 2)
-        ]
-        for cx, cy in corners:
-            gx, gy = pixel_to_grid(cx, cy)
-            # out of bounds -> blocked
-            if not (0 <= gx < GRID_COLS and 0 <= gy < GRID_ROWS):
-                return False
-            if self.grid[gy][gx] == 0:
-                return False
-        return True
+    def can_move_to(self, px, py, size=PLAYER_SIZE):
+        # wall test for a size x size box at (px, py)
+        return self.collider(size).can_move_to(px, py)
 
-# Create game instance
-game = MazeRunner()
+    def set_wall(self, cell, wall=True):
+        # edit the current maze in place; derived data is rebuilt, the chaser repairs its path
+        x, y = cell
+        if not self.grid.interior(x, y):
+            return
+        self.grid[y][x] = 0 if wall else 1
+        self.collision = CollisionMap(self.grid)
+        self.grid_edits += 1
+        invalidate_maze_surface()
+        self.chase.wall_changed(cell)
+        if self.flow is not self.chase:
+            self.flow.wall_changed(cell)  # the swarm's own field
 
 # UI button rects
 start_button = pygame.Rect(300, 220, 200, 50)
@@ -406,35 +2077,193 @@ right_btn = pygame.Rect(30 + btn_size*2 + 10, pad_y, btn_size, btn_size)
 up_btn = pygame.Rect(30 + btn_size + 5, pad_y - btn_size - 8, btn_size, btn_size)
 down_btn = pygame.Rect(30 + btn_size + 5, pad_y, btn_size, btn_size)
 
-# Helper to draw maze
-def draw_maze(surface, grid):
+# Static maze layer: rendered once per grid, then blitted in a single call per frame
+_maze_surface = None
+_maze_surface_grid = None
+
+def render_maze_surface(grid, convert=True):
+    # convert=False when rendering off the main thread; prime_maze_surface() converts later
+    grid = as_grid(grid)
+    cells = grid.cells
+    # +1 so the closing grid lines on the right/bottom edge fit
+    surf = pygame.Surface((MAZE_PIXEL_WIDTH + 1, MAZE_PIXEL_HEIGHT + 1))
+    if convert and pygame.display.get_surface() is not None:
+        surf = surf.convert()
+    surf.fill(BLACK)
     for y in range(GRID_ROWS):
+        row = y * grid.stride
         for x in range(GRID_COLS):
-            cell = grid[y][x]
-            px = OFFSET_X + x * TILE
-            py = OFFSET_Y + y * TILE
-            if cell == 0:
-                pygame.draw.rect(surface, DARK_GRAY, (px, py, TILE, TILE))
-            else:
-                # draw floor
-                pygame.draw.rect(surface, BLACK, (px, py, TILE, TILE))
+            # floor is already black, only walls need filling
+            if cells[row + x] == 0:
+                surf.fill(DARK_GRAY, (x * TILE, y * TILE, TILE, TILE))
 
     # draw grid lines lightly
     for y in range(GRID_ROWS+1):
-        pygame.draw.line(surface, (30,30,30), (OFFSET_X, OFFSET_Y + y*TILE), (OFFSET_X + MAZE_PIXEL_WIDTH, OFFSET_Y + y*TILE), 1)
+        pygame.draw.line(surf, (30,30,30), (0, y*TILE), (MAZE_PIXEL_WIDTH, y*TILE), 1)
     for x in range(GRID_COLS+1):
-        pygame.draw.line(surface, (30,30,30), (OFFSET_X + x*TILE, OFFSET_Y), (OFFSET_X + x*TILE, OFFSET_Y + MAZE_PIXEL_HEIGHT), 1)
+        pygame.draw.line(surf, (30,30,30), (x*TILE, 0), (x*TILE, MAZE_PIXEL_HEIGHT), 1)
+    return surf
+
+def invalidate_maze_surface():
+    # call after editing a grid in place; replacing the grid object is detected automatically
+    global _maze_surface, _maze_surface_grid
+    _maze_surface = None
+    _maze_surface_grid = None
+
+def prime_maze_surface(grid, surf):
+    # install a surface rendered ahead of time (e.g. by the level prefetcher)
+    global _maze_surface, _maze_surface_grid
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()
+    _maze_surface = surf
+    _maze_surface_grid = grid
+
+# Helper to draw maze
+def draw_maze(surface, grid):
+    global _maze_surface, _maze_surface_grid
+    if grid is not _maze_surface_grid or _maze_surface is None:
+        _maze_surface = render_maze_surface(grid)
+        _maze_surface_grid = grid
+    surface.blit(_maze_surface, (OFFSET_X, OFFSET_Y))
+
+# Playing-screen pieces, shared by the full redraw and the dirty-rect renderer
+def draw_title(surface):
+    title = render_text(big_font, "MAZE RUNNER", WHITE)
+    surface.blit(title, ((SCREEN_WIDTH - title.get_width())//2, 8))
+
+def draw_exit_tile(surface):
+    # draw exit tile highlight (bottom-right)
+    ex_px = OFFSET_X + (GRID_COLS-2)*TILE
+    ey_px = OFFSET_Y + (GRID_ROWS-2)*TILE
+    pygame.draw.rect(surface, ORANGE, (ex_px+2, ey_px+2, TILE-4, TILE-4))
+
+def entity_rects(game, alpha=1.0):
+    # player first, then the main enemy and any swarm enemies; the Rects are the entities' own
+    return [game.player.draw_rect(alpha), game.enemy.draw_rect(alpha)] + game.swarm.draw_rects(alpha)
+
+def draw_entities(surface, game, alpha=1.0):
+    player_rect, *enemy_rects = entity_rects(game, alpha)
+    pygame.draw.rect(surface, GREEN, player_rect)
+    for r in enemy_rects:
+        pygame.draw.rect(surface, RED, r)
+
+def hud_text(game):
+    return f"Level: {game.level}    Lives: {game.lives}    Goal: Reach orange tile"
+
+def draw_hud(surface, game):
+    hud = render_text(font, hud_text(game), WHITE)
+    return surface.blit(hud, (10, SCREEN_HEIGHT - 30))
+
+def debug_text(game):
+    if not game.show_debug:
+        return None
+    pcx, pcy = game.player.cell
+    ecx, ecy = game.enemy.cell
+    return f"Pcell:{pcx, pcy} Ecell:{ecx, ecy} Seed:{game.seed}"
+
+def draw_debug(surface, game):
+    text = debug_text(game)
+    if text is None:
+        return None
+    return surface.blit(render_text(font, text, YELLOW), (10, 50))
+
+def draw_touch_controls(surface, clip_rects=None):
+    # with clip_rects, only buttons touching one of those rects are redrawn
+    for btn, points in (
+        (left_btn, [(left_btn.centerx-8,left_btn.centery),(left_btn.centerx+8,left_btn.centery-12),(left_btn.centerx+8,left_btn.centery+12)]),
+        (right_btn, [(right_btn.centerx+8,right_btn.centery),(right_btn.centerx-8,right_btn.centery-12),(right_btn.centerx-8,right_btn.centery+12)]),
+        (up_btn, [(up_btn.centerx,up_btn.centery-10),(up_btn.centerx-12,up_btn.centery+8),(up_btn.centerx+12,up_btn.centery+8)]),
+        (down_btn, [(down_btn.centerx,down_btn.centery+10),(down_btn.centerx-12,down_btn.centery-8),(down_btn.centerx+12,down_btn.centery-8)]),
+    ):
+        if clip_rects is not None and btn.collidelist(clip_rects) == -1:
+            continue
+        pygame.draw.rect(surface, (60,60,60), btn)
+        pygame.draw.polygon(surface, WHITE, points)
+
+# Dirty-rectangle renderer for the playing screen
+class DirtyRectRenderer:
+    """
+    Composes the static layer (background, title, maze, exit tile) once per
+    level, then each frame restores only the areas under the moving sprites
+    and changed HUD text and pushes those rects with pygame.display.update().
+    Overlays (HUD, touch pad) are redrawn only where a dirty rect touches them.
+    """
+    def __init__(self):
+        self.background = None
+        self.grid = None
+        self.grid_edits = 0
+        self.prev_rects = []
+        self.prev_text = None
+        self.text_rects = []
+
+    def reset(self):
+        self.background = None
+        self.grid = None
+
+    def build_background(self, game):
+        bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        bg.fill((22,22,22))
+        draw_title(bg)
+        draw_maze(bg, game.grid)
+        draw_exit_tile(bg)
+        self.background = bg
+        self.grid = game.grid
+        self.grid_edits = game.grid_edits
+
+    def draw_text(self, surface, game):
+        rects = [draw_hud(surface, game)]
+        debug_rect = draw_debug(surface, game)
+        if debug_rect:
+            rects.append(debug_rect)
+        return rects
+
+    def draw(self, surface, game, alpha=1.0):
+        # sprites may land on fractional pixels; pad so erase covers them fully
+        sprite_rects = [r.inflate(2, 2) for r in entity_rects(game, alpha)]
+        text = (hud_text(game), debug_text(game))
+
+        if self.background is None or game.grid is not self.grid or game.grid_edits != self.grid_edits:
+            self.build_background(game)
+            surface.blit(self.background, (0, 0))
+            draw_entities(surface, game, alpha)
+            self.text_rects = self.draw_text(surface, game)
+            draw_touch_controls(surface)
+            pygame.display.flip()
+        else:
+            dirty = self.prev_rects + sprite_rects
+            # antialiased text can't be blended twice, so restore its whole rect before redrawing it
+            redraw_text = text != self.prev_text or any(r.collidelist(dirty) != -1 for r in self.text_rects)
+            if redraw_text:
+                dirty += self.text_rects
+            for r in dirty:
+                surface.blit(self.background, r, r)
+            draw_entities(surface, game, alpha)
+            if redraw_text:
+                self.text_rects = self.draw_text(surface, game)
+                dirty += self.text_rects
+            draw_touch_controls(surface, dirty)
+            pygame.display.update(dirty)
+
+        self.prev_rects = sprite_rects
+        self.prev_text = text
 
 # Main loop
-def main_loop():
+def main_loop(dirty_rects=DIRTY_RECT_RENDERING, seed=None, pack=None, algorithm=MAZE_ALGORITHM,
+              pathfinder=ENEMY_PATHFINDER, hop_cache=None, render_fps=FPS, multi_enemy=False):
+    init_display()
+    init_audio()
+    game = MazeRunner(seed, prefetch=True, prerender=True, pack=pack, algorithm=algorithm,
+                      pathfinder=pathfinder, hop_cache=hop_cache, multi_enemy=multi_enemy)
+    renderer = DirtyRectRenderer() if dirty_rects else None
     start_bg_music()
     running = True
     input_dx = 0
     input_dy = 0
     mouse_held = False
+    accumulator = 0.0
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        dt = clock.tick(render_fps) / 1000.0
         input_dir = (0,0)
         # Default keyboard dx/dy
         keys = pygame.key.get_pressed()
@@ -459,14 +2288,11 @@ def main_loop():
                 if game.state == "menu":
                     if start_button.collidepoint((mx,my)):
                         play_sound('button')
-                        game.state = "playing"
-                        game.level = 1
-                        game.lives = START_LIVES
-                        game.grid = generate_maze(game.level)
-                        game.reset_positions()
+                        game.start()
                         start_bg_music()
                     if exit_button.collidepoint((mx,my)):
                         play_sound('button')
+                        game.close()
                         pygame.quit()
                         sys.exit()
                 elif game.state == "game_over":
@@ -519,14 +2345,23 @@ def main_loop():
 
         input_dir = (input_dx, input_dy)
 
-        # Update game
-        game.update(dt, input_dir)
+        # Update game in fixed ticks; whatever time is left over sets how far to interpolate
+        accumulator = min(accumulator + dt, MAX_SIM_STEPS * SIM_DT)
+        while accumulator >= SIM_DT:
+            game.update(SIM_DT, input_dir)
+            accumulator -= SIM_DT
+        alpha = accumulator / SIM_DT
 
         # Drawing
+        if game.state == "playing" and renderer:
+            renderer.draw(screen, game, alpha)
+            continue
+        if renderer:
+            renderer.reset()
+
         screen.fill((22,22,22))
         # Title and HUD
-        title = big_font.render("MAZE RUNNER", True, WHITE)
-        screen.blit(title, ((SCREEN_WIDTH - title.get_width())//2, 8))
+        draw_title(screen)
 
         if game.state == "menu":
             # Draw small preview maze
@@ -538,63 +2373,391 @@ def main_loop():
             draw_button("START GAME", start_button, BLUE)
             draw_button("EXIT", exit_button, RED)
             # Info text
-            info = font.render("Use keyboard or on-screen arrows (touch). 100 levels. Player & enemy same speed.", True, WHITE)
+            info = render_text(font, "Use keyboard or on-screen arrows (touch). 100 levels. Player & enemy same speed.", WHITE)
             screen.blit(info, (OFFSET_X, OFFSET_Y + MAZE_PIXEL_HEIGHT + 8))
 
         elif game.state == "playing":
             # draw maze
             draw_maze(screen, game.grid)
-
-            # draw exit tile highlight (bottom-right)
-            ex_px = OFFSET_X + (GRID_COLS-2)*TILE
-            ey_px = OFFSET_Y + (GRID_ROWS-2)*TILE
-            pygame.draw.rect(screen, ORANGE, (ex_px+2, ey_px+2, TILE-4, TILE-4))
-
-            # draw player
-            pygame.draw.rect(screen, GREEN, (game.player_pos[0], game.player_pos[1], PLAYER_SIZE, PLAYER_SIZE))
-            # draw enemy
-            pygame.draw.rect(screen, RED, (game.enemy_pos[0], game.enemy_pos[1], ENEMY_SIZE, ENEMY_SIZE))
+            draw_exit_tile(screen)
+            # draw player & enemy
+            draw_entities(screen, game, alpha)
             # HUD: Level & Lives
-            hud = font.render(f"Level: {game.level}    Lives: {game.lives}    Goal: Reach orange tile", True, WHITE)
-            screen.blit(hud, (10, SCREEN_HEIGHT - 30))
-
+            draw_hud(screen, game)
             # Draw on-screen touch controls
-            pygame.draw.rect(screen, (60,60,60), left_btn)
-            pygame.draw.polygon(screen, WHITE, [(left_btn.centerx-8,left_btn.centery),(left_btn.centerx+8,left_btn.centery-12),(left_btn.centerx+8,left_btn.centery+12)])
-            pygame.draw.rect(screen, (60,60,60), right_btn)
-            pygame.draw.polygon(screen, WHITE, [(right_btn.centerx+8,right_btn.centery),(right_btn.centerx-8,right_btn.centery-12),(right_btn.centerx-8,right_btn.centery+12)])
-            pygame.draw.rect(screen, (60,60,60), up_btn)
-            pygame.draw.polygon(screen, WHITE, [(up_btn.centerx,up_btn.centery-10),(up_btn.centerx-12,up_btn.centery+8),(up_btn.centerx+12,up_btn.centery+8)])
-            pygame.draw.rect(screen, (60,60,60), down_btn)
-            pygame.draw.polygon(screen, WHITE, [(down_btn.centerx,down_btn.centery+10),(down_btn.centerx-12,down_btn.centery-8),(down_btn.centerx+12,down_btn.centery-8)])
-
+            draw_touch_controls(screen)
             # small debug: draw player & enemy cells
-            if game.show_debug:
-                pcx, pcy = game.player_cell
-                ecx, ecy = game.enemy_cell
-                text = font.render(f"Pcell:{pcx, pcy} Ecell:{ecx, ecy}", True, YELLOW)
-                screen.blit(text, (10, 50))
+            draw_debug(screen, game)
 
         elif game.state == "game_over":
             # draw last maze faded
             draw_maze(screen, game.grid)
-            go_text = big_font.render("GAME OVER", True, RED)
+            go_text = render_text(big_font, "GAME OVER", RED)
             screen.blit(go_text, ((SCREEN_WIDTH - go_text.get_width())//2, 160))
             draw_button("RESTART (to Menu)", restart_button, BLUE)
             # lives zero indicator
-            msg = font.render("You lost all lives. Click restart to go back to menu.", True, WHITE)
+            msg = render_text(font, "You lost all lives. Click restart to go back to menu.", WHITE)
             screen.blit(msg, ((SCREEN_WIDTH - msg.get_width())//2, 320))
 
         elif game.state == "win":
-            win_text = big_font.render("YOU WIN!", True, YELLOW)
+            win_text = render_text(big_font, "YOU WIN!", YELLOW)
             screen.blit(win_text, ((SCREEN_WIDTH - win_text.get_width())//2, 200))
-            info = font.render("You've completed all levels! Click anywhere to return to menu.", True, WHITE)
+            info = render_text(font, "You've completed all levels! Click anywhere to return to menu.", WHITE)
             screen.blit(info, ((SCREEN_WIDTH - info.get_width())//2, 280))
 
         pygame.display.flip()
 
+    game.close()
     pygame.quit()
     sys.exit()
 
+# Scripted player for headless runs: walks the shortest path to the exit tile
+def autopilot_input(game, field):
+    field.update(game.grid, game.target_cell)
+    next_cell = field.next_step(game.player.cell)
+    if next_cell is None:
+        return (0,0)
+    tx, ty = grid_to_pixel(*next_cell)
+    dx = tx - PLAYER_SIZE//2 - game.player.x
+    dy = ty - PLAYER_SIZE//2 - game.player.y
+    # step toward the next cell, aligning on the other axis so corners clear the walls
+    dx = max(-PLAYER_SPEED, min(PLAYER_SPEED, dx))
+    dy = max(-PLAYER_SPEED, min(PLAYER_SPEED, dy))
+    return (dx, dy)
+
+# Headless simulation: no window, no mixer, update() as fast as the CPU allows
+def run_headless(games=1, max_frames=SIM_HZ * 60 * 10, seed=None, pack=None, algorithm=MAZE_ALGORITHM,
+                 pathfinder=ENEMY_PATHFINDER, hop_cache=None, multi_enemy=False):
+    results = []
+    dt = SIM_DT
+    for i in range(games):
+        game = MazeRunner(None if seed is None else seed + i, pack=pack, algorithm=algorithm,
+                          pathfinder=pathfinder, hop_cache=hop_cache, multi_enemy=multi_enemy)
+        pilot = ChaseField()
+        game.start()
+        frames = 0
+        while game.state == "playing" and frames < max_frames:
+            game.update(dt, autopilot_input(game, pilot))
+            frames += 1
+        results.append({'seed': game.seed, 'state': game.state, 'level': game.level, 'lives': game.lives, 'frames': frames})
+    return results
+
+# Batch simulation: many games of one level stepped together as NumPy arrays
+def next_hop_array(grid, dist):
+    """
+    dist is a (roots, cells) array of distance fields. Returns the same shape
+    holding, per root and cell, the flat index of the neighbour one step closer
+    to the root (-1 if none), picked in the same order as ChaseField.next_step.
+    """
+    w = grid.width
+    h = grid.height
+    idx = np.arange(len(grid.cells))
+    inner = idx[(idx % grid.stride > 0) & (idx % grid.stride < w-1) & (idx // grid.stride > 0) & (idx // grid.stride < h-1)]
+    hop = np.full(dist.shape, -1, dtype=np.int32)
+    d = dist[:, inner]
+    for delta in reversed(grid.deltas):
+        step = (d > 0) & (dist[:, inner + delta] == d - 1)
+        hop[:, inner] = np.where(step, inner + delta, hop[:, inner])
+    return hop
+
+class BatchCollider:
+    # BoxCollider tables as arrays, so one call tests every game's move at once
+    def __init__(self, box):
+        self.x_lo = box.x_lo
+        self.y_lo = box.y_lo
+        self.nx = box.nx
+        self.ny = box.ny
+        self.col = np.array(box.col)
+        self.row = np.array(box.row)
+        self.xkey = np.array(box.xkey)
+        self.ykey = np.array(box.ykey)
+        self.blocks = np.frombuffer(b''.join(box.blocks), dtype=np.uint8).reshape(len(box.blocks), -1)
+
+    def can_move_to(self, px, py):
+        # astype truncates toward zero, like int() in BoxCollider
+        i = np.clip(px.astype(np.int64) - self.x_lo, 0, self.nx - 1)
+        j = np.clip(py.astype(np.int64) - self.y_lo, 0, self.ny - 1)
+        return self.blocks[self.xkey[i] + self.ykey[j], self.col[i] + self.row[j]] == 1
+
+class BatchSimulator:
+    """
+    Steps N games of one level in lockstep with the same rules as
+    MazeRunner.update and the headless autopilot as the player. All games share
+    the level's collision tables and an all-cells next-hop table (one distance
+    field per open cell), so a tick is a fixed number of array operations.
+    wander is the per-tick chance an idle autopilot walks one tile in a random
+    direction instead, which is what makes the games differ.
+    """
+    def __init__(self, grid, games, seed=None, wander=0.0):
+        if np is None:
+            raise RuntimeError("BatchSimulator needs numpy")
+        grid = as_grid(grid)
+        self.grid = grid
+        self.games = games
+        self.wander = wander
+        self.rng = np.random.default_rng(seed)
+        stride = grid.stride
+        idx = np.arange(len(grid.cells))
+        self.center_x = OFFSET_X + (idx % stride) * TILE + TILE//2
+        self.center_y = OFFSET_Y + (idx // stride) * TILE + TILE//2
+        self.start_cell = grid.index(1, 1)
+        self.exit_cell = grid.index(GRID_COLS-2, GRID_ROWS-2)
+
+        fields = np.full((len(grid.cells), len(grid.cells)), -1, dtype=np.int32)
+        for root in np.flatnonzero(np.frombuffer(grid.cells, dtype=np.uint8)):
+            fields[root] = distance_field(grid, grid.cell(root))
+        self.hop = next_hop_array(grid, fields)  # hop[player cell, enemy cell] -> enemy's next cell
+        self.to_exit = next_hop_array(grid, np.array([distance_field(grid, grid.cell(self.exit_cell))]))[0]
+
+        collision = CollisionMap(grid)
+        self.player_box = BatchCollider(collision.collider(PLAYER_SIZE))
+        self.enemy_box = BatchCollider(collision.collider(ENEMY_SIZE))
+
+        n = games
+        self.lives = np.full(n, START_LIVES)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.wander_dir = np.zeros(n, dtype=np.int64)
+        self.wander_ticks = np.zeros(n, dtype=np.int64)
+        self.wander_steps = np.array(DIRS) * PLAYER_SPEED
+        self.px = np.zeros(n)
+        self.py = np.zeros(n)
+        self.ex = np.zeros(n)
+        self.ey = np.zeros(n)
+        self.pcell = np.zeros(n, dtype=np.int64)
+        self.reset_positions(np.ones(n, dtype=bool))
+
+    def reset_positions(self, mask):
+        px, py = grid_to_pixel(1,1)
+        ex, ey = grid_to_pixel(GRID_COLS-2, GRID_ROWS-2)
+        self.px[mask] = px - PLAYER_SIZE//2
+        self.py[mask] = py - PLAYER_SIZE//2
+        self.ex[mask] = ex - ENEMY_SIZE//2
+        self.ey[mask] = ey - ENEMY_SIZE//2
+        self.pcell[mask] = self.start_cell
+
+    def cells_of(self, x, y, size):
+        # vectorized pixel_to_grid of the box centre, as a flat index (positions are never negative)
+        gx = np.clip((x.astype(np.int64) + (size//2 - OFFSET_X)) // TILE, 0, GRID_COLS-1)
+        gy = np.clip((y.astype(np.int64) + (size//2 - OFFSET_Y)) // TILE, 0, GRID_ROWS-1)
+        return gy * self.grid.stride + gx
+
+    def player_input(self):
+        nxt = self.to_exit[self.pcell]
+        has = nxt >= 0
+        dx = np.where(has, np.clip(self.center_x[nxt] - PLAYER_SIZE//2 - self.px, -PLAYER_SPEED, PLAYER_SPEED), 0)
+        dy = np.where(has, np.clip(self.center_y[nxt] - PLAYER_SIZE//2 - self.py, -PLAYER_SPEED, PLAYER_SPEED), 0)
+        if self.wander:
+            pick = (self.wander_ticks == 0) & (self.rng.random(self.games) < self.wander)
+            self.wander_dir[pick] = self.rng.integers(0, 4, int(pick.sum()))
+            self.wander_ticks[pick] = TILE // PLAYER_SPEED
+            roaming = self.wander_ticks > 0
+            dirs = self.wander_steps[self.wander_dir]
+            dx = np.where(roaming, dirs[:, 0], dx)
+            dy = np.where(roaming, dirs[:, 1], dy)
+            self.wander_ticks[roaming] -= 1
+        return dx, dy
+
+    def step(self):
+        active = ~self.done
+
+        # player
+        dx, dy = self.player_input()
+        new_x = self.px + dx
+        new_y = self.py + dy
+        move_x = active & self.player_box.can_move_to(new_x, self.py)
+        move_y = active & self.player_box.can_move_to(self.px, new_y)
+        self.px = np.where(move_x, new_x, self.px)
+        self.py = np.where(move_y, new_y, self.py)
+        self.pcell = self.cells_of(self.px, self.py, PLAYER_SIZE)
+        ecell = self.cells_of(self.ex, self.ey, ENEMY_SIZE)
+
+        # enemy: next cell from the shared table, then normalized step like MazeRunner.update
+        nxt = self.hop[self.pcell, ecell]
+        dir_x = self.center_x[nxt] - (self.ex + ENEMY_SIZE//2)
+        dir_y = self.center_y[nxt] - (self.ey + ENEMY_SIZE//2)
+        moving = active & (nxt >= 0) & ((dir_x != 0) | (dir_y != 0))
+        dist = np.maximum(1, np.sqrt(dir_x**2 + dir_y**2))
+        new_ex = self.ex + ENEMY_SPEED * dir_x / dist
+        new_ey = self.ey + ENEMY_SPEED * dir_y / dist
+        self.ex = np.where(moving & self.enemy_box.can_move_to(new_ex, self.ey), new_ex, self.ex)
+        self.ey = np.where(moving & self.enemy_box.can_move_to(self.ex, new_ey), new_ey, self.ey)
+
+        # catch: integer AABB overlap, as pygame.Rect.colliderect
+        pxi = self.px.astype(np.int64)
+        pyi = self.py.astype(np.int64)
+        exi = self.ex.astype(np.int64)
+        eyi = self.ey.astype(np.int64)
+        caught = active & (pxi < exi + ENEMY_SIZE) & (exi < pxi + PLAYER_SIZE) & (pyi < eyi + ENEMY_SIZE) & (eyi < pyi + PLAYER_SIZE)
+        self.lives -= caught
+        lost = caught & (self.lives <= 0)
+        self.reset_positions(caught & ~lost)
+
+        # exit
+        won = active & ~lost & (self.pcell == self.exit_cell)
+        self.won |= won
+        self.done |= lost | won
+        self.ticks += active
+
+    def run(self, max_ticks):
+        for _ in range(max_ticks):
+            if self.done.all():
+                break
+            self.step()
+        won = int(self.won.sum())
+        lost = int((self.done & ~self.won).sum())
+        return {
+            'games': self.games,
+            'won': won,
+            'lost': lost,
+            'timeout': self.games - won - lost,
+            'win_ticks': float(self.ticks[self.won].mean()) if won else None,
+        }
+
+def simulate_levels(level_grids, games, max_ticks, seed=None, wander=0.0):
+    # level_grids: iterable of (level, grid); yields (level, BatchSimulator.run() summary)
+    for lvl, grid in level_grids:
+        sim = BatchSimulator(grid, games, None if seed is None else seed + lvl, wander)
+        yield lvl, sim.run(max_ticks)
+
+# Difficulty sweep: maze statistics over many seeds per level, spread across processes
+def count_dead_ends(grid):
+    grid = as_grid(grid)
+    cells = grid.cells
+    deltas = grid.deltas
+    dead = 0
+    for y in range(1, grid.height-1):
+        for i in range(y*grid.stride + 1, y*grid.stride + grid.width-1):
+            if cells[i] == 1 and cells[i+deltas[0]] + cells[i+deltas[1]] + cells[i+deltas[2]] + cells[i+deltas[3]] == 1:
+                dead += 1
+    return dead
+
+def maze_stats(level, game_seed, algorithm=MAZE_ALGORITHM):
+    # (solvable, start-exit path length or None, dead-end count) for one generated level
+    grid = generate_maze(level, level_rng(game_seed, level), algorithm_for_level(algorithm, level))
+    path = bfs_path(grid, (1,1), (GRID_COLS-2, GRID_ROWS-2))
+    return path is not None, len(path) - 1 if path else None, count_dead_ends(grid)
+
+def sweep_level(task):
+    level, seeds, algorithm = task
+    stats = [maze_stats(level, seed, algorithm) for seed in seeds]
+    lengths = [length for ok, length, _ in stats if ok]
+    return {
+        'level': level,
+        'mazes': len(stats),
+        'solvable': len(lengths),
+        'mean_path': sum(lengths) / len(lengths) if lengths else None,
+        'mean_dead_ends': sum(dead for _, _, dead in stats) / len(stats),
+    }
+
+def run_sweep(levels, seeds, workers=None, algorithm=MAZE_ALGORITHM):
+    # one task per level; results come back in level order
+    tasks = [(lvl, seeds, algorithm) for lvl in levels]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(sweep_level, tasks)
+
+# Generator throughput: cells per second of carving alone, on a width x height grid
+def benchmark_generators(width=201, height=201, repeat=3, seed=0):
+    results = {}
+    for name, carve in MAZE_GENERATORS.items():
+        rng = random.Random(seed)
+        grids = [Grid(width, height) for _ in range(repeat)]
+        t0 = time.perf_counter()
+        for grid in grids:
+            carve(grid, rng)
+        results[name] = width * height * repeat / (time.perf_counter() - t0)
+    return results
+
+def parse_algorithm(text):
+    for name in text.split(','):
+        if name not in MAZE_GENERATORS:
+            raise argparse.ArgumentTypeError(f"unknown generator {name!r} (choose from {', '.join(MAZE_GENERATORS)})")
+    return text
+
+def parse_levels(text):
+    # "5" or "1-100"
+    lo, _, hi = text.partition('-')
+    return range(int(lo), int(hi or lo) + 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maze Runner")
+    parser.add_argument('--headless', action='store_true', help="simulate games with a scripted player, no display or audio")
+    parser.add_argument('--games', type=int, default=1, help="number of headless games to simulate")
+    parser.add_argument('--max-frames', type=int, default=SIM_HZ * 60 * 10, help="tick limit per headless game")
+    parser.add_argument('--seed', type=int, default=None, help="game seed; the same seed always produces the same levels")
+    parser.add_argument('--pack', metavar='PATH', help="play levels from a maze pack file")
+    parser.add_argument('--build-pack', metavar='PATH', help="generate all levels into a maze pack file and exit")
+    parser.add_argument('--batch', action='store_true', help="estimate per-level survival with the NumPy batch simulator (--games per level)")
+    parser.add_argument('--wander', type=float, default=0.05, help="batch: per-tick chance the scripted player wanders off its path")
+    parser.add_argument('--sweep', action='store_true', help="report solvability, path length and dead ends per level over many seeds")
+    parser.add_argument('--seeds', type=int, default=100, help="sweep: seeds per level, starting at --seed (default 0)")
+    parser.add_argument('--workers', type=int, default=None, help="sweep: worker processes (default: one per CPU)")
+    parser.add_argument('--levels', type=parse_levels, default=range(1, MAX_LEVEL + 1), help="batch/sweep: level or range, e.g. 1-20")
+    parser.add_argument('--algorithm', type=parse_algorithm, default=MAZE_ALGORITHM,
+                        help=f"maze generator ({', '.join(MAZE_GENERATORS)}); a comma-separated list is cycled per level")
+    parser.add_argument('--pathfinder', choices=['field', 'repair', 'table'] + list(PATHFINDERS), default=ENEMY_PATHFINDER,
+                        help="enemy steering: shared distance field, repaired path, next-hop table, or a point-to-point search")
+    parser.add_argument('--enemies', action='store_true',
+                        help=f"add an enemy every {ENEMY_LEVEL_STEP} levels (up to {MAX_ENEMIES}), all sharing one flow field")
+    parser.add_argument('--hop-cache', metavar='DIR', help="table: keep per-maze next-hop tables in DIR")
+    parser.add_argument('--bench-generators', action='store_true', help="print carving throughput of every maze generator")
+    parser.add_argument('--stream-maze', metavar='PATH', help="stream a --width x --height Eller maze to a file, row by row")
+    parser.add_argument('--width', type=int, default=GRID_COLS, help="stream: maze width in cells")
+    parser.add_argument('--height', type=int, default=GRID_ROWS, help="stream: maze height in cells")
+    parser.add_argument('--fps', type=int, default=FPS, help=f"render rate; the simulation always runs at {SIM_HZ} ticks/s")
+    parser.add_argument('--full-redraw', action='store_true', help="redraw and flip the whole screen every frame")
+    args = parser.parse_args()
+
+    if args.bench_generators:
+        for name, rate in benchmark_generators().items():
+            print(f"{name:12s} {rate:12,.0f} cells/s")
+        return
+
+    if args.stream_maze:
+        seed = args.seed if args.seed is not None else new_game_seed()
+        t0 = time.perf_counter()
+        write_maze_stream(args.stream_maze, args.width, args.height, seed)
+        elapsed = time.perf_counter() - t0
+        print(f"wrote {args.stream_maze}: {args.width}x{args.height} seed={seed} "
+              f"{os.path.getsize(args.stream_maze):,} bytes in {elapsed:.1f}s ({args.height / elapsed:,.0f} rows/s)")
+        return
+
+    if args.build_pack:
+        seed = args.seed if args.seed is not None else new_game_seed()
+        build_maze_pack(args.build_pack, seed, algorithm=args.algorithm)
+        pack = MazePack(args.build_pack)
+        solvable = sum(1 for lvl in range(1, pack.count + 1) if pack.info(lvl)[1] & PACK_SOLVABLE)
+        print(f"wrote {args.build_pack}: {pack.count} levels, seed={seed}, solvable={solvable}/{pack.count}")
+        pack.close()
+        return
+
+    if args.sweep:
+        base = args.seed if args.seed is not None else 0
+        print(f"seeds {base}..{base + args.seeds - 1} per level")
+        for r in run_sweep(args.levels, range(base, base + args.seeds), args.workers, args.algorithm):
+            path = f"{r['mean_path']:.1f}" if r['mean_path'] is not None else "-"
+            print(f"level {r['level']:3d}: solvable {100.0 * r['solvable'] / r['mazes']:5.1f}%  "
+                  f"mean path {path:>6}  mean dead ends {r['mean_dead_ends']:.1f}")
+        return
+
+    pack = MazePack(args.pack) if args.pack else None
+    if args.batch:
+        runner = MazeRunner(args.seed, pack=pack, algorithm=args.algorithm)
+        grids = ((lvl, runner.level_grid(runner.seed, lvl)) for lvl in args.levels)
+        print(f"seed={runner.seed} games/level={args.games}")
+        for lvl, r in simulate_levels(grids, args.games, args.max_frames, runner.seed, args.wander):
+            ticks = f"{r['win_ticks']:.0f}" if r['win_ticks'] is not None else "-"
+            print(f"level {lvl:3d}: won {r['won']}/{r['games']} lost {r['lost']} timeout {r['timeout']} mean win ticks {ticks}")
+        return
+    if args.headless:
+        for i, r in enumerate(run_headless(args.games, args.max_frames, args.seed, pack, args.algorithm,
+                                           args.pathfinder, args.hop_cache, args.enemies)):
+            print(f"game {i+1}: seed={r['seed']} {r['state']} level={r['level']} lives={r['lives']} frames={r['frames']}")
+        return
+    main_loop(dirty_rects=not args.full_redraw, seed=args.seed, pack=pack, algorithm=args.algorithm,
+              pathfinder=args.pathfinder, hop_cache=args.hop_cache, render_fps=args.fps,
+              multi_enemy=args.enemies)
+
 if __name__ == "__main__":
-    main_loop()
+    main()